@@ -1,6 +1,9 @@
-from queue import PriorityQueue
 import numpy as np
 
+from frontier import IndexedHeap, BucketQueue
+from adjacency import as_adjacency, UNIT_COSTS
+from search_state import SearchState, UNREACHED, meeting_path
+
 
 def heuristic(a, b):
     """
@@ -25,31 +28,21 @@ class AStar:
     A-star algorithm solver for maze graph
     """
 
-    def __init__(self, graph, start, goal):
+    def __init__(self, graph, start, goal, frontier=IndexedHeap):
         """
         Initializing all of the parameters necessary to solve the maze using A star """
         self.graph = graph
         self.start = start
         self.goal = goal
-        self.h, self.w = self.graph.shape
-        self.h -= 1
-        self.w -= 1
-
-        self.closed_set = set()
-        self.open_set = set()
-        self.open_set.add(start)
-
-        self.came_from = {}
+        self.adjacency = as_adjacency(graph)
 
-        self.g_score = {}
-        for i in range(self.h + 1):
-            for j in range(self.w + 1):
-                self.g_score[(i, j)] = float("inf")
+        self.state = SearchState(self.adjacency)
+        self.start_index = self.state.index(start)
+        self.goal_index = self.state.index(goal)
 
-        self.g_score[start] = 0
-
-        self.f_score = self.g_score.copy()
-        self.f_score[start] = heuristic(start, goal)
+        self.open_set = frontier()
+        self.state.dist[self.start_index] = 0
+        self.open_set.push(self.start_index, heuristic(start, goal))
 
     def __iter__(self):
         return self
@@ -59,75 +52,50 @@ class AStar:
         This makes the solver work in a Python generator style fashion, allowing the visualizer to call next until
         None is returned, which signifies that the maze has been solved
         """
-        while len(self.open_set) != 0:
-            current = min(self.open_set, key=self.f_score.get)
-            if current == self.goal:
+        g_score = self.state.dist
+        closed = self.state.closed
+        while self.open_set:
+            current = self.open_set.pop()
+            if current == self.goal_index:
                 break
 
-            self.open_set.remove(current)
-            self.closed_set.add(current)
+            closed[current] = True
 
             # Find the proper "neighbours" of this "current" point
-            for neighbour in self._get_neighbours(current):
-                if neighbour in self.closed_set:
+            current_g_score = int(g_score[current])
+            weights = self.adjacency.weights
+            costs = UNIT_COSTS if weights is None else weights[current]
+            for neighbour, cost in zip(self.adjacency.neighbours[current], costs):
+                if closed[neighbour]:
                     continue
 
-                if neighbour not in self.open_set:
-                    self.open_set.add(neighbour)
-
-                # tentative_g_score = self.g_score[current] + self.dist(current, neighbour)
-                tentative_g_score = self.g_score[current] + 1
-                if tentative_g_score >= self.g_score[neighbour]:
+                tentative_g_score = current_g_score + cost
+                if g_score[neighbour] != UNREACHED and tentative_g_score >= g_score[neighbour]:
                     continue
 
-                self.came_from[neighbour] = current
-                self.g_score[neighbour] = tentative_g_score
-                self.f_score[neighbour] = self.g_score[neighbour] + heuristic(neighbour, self.goal)
-
-            return current
-
-    def _get_neighbours(self, current):
-        """
-        A simple method to fetch the allowed neighbours of a given location in the maze """
-        r, c = current
-        neighbours = []
-
-        if r - 1 >= 0 and self.graph[r - 1, c] != 1:
-            neighbours.append((r - 1, c))
-
-        if r + 1 <= self.h and self.graph[r + 1, c] != 1:
-            neighbours.append((r + 1, c))
-
-        if c - 1 >= 0 and self.graph[r, c - 1] != 1:
-            neighbours.append((r, c - 1))
+                self.state.parent[neighbour] = current
+                g_score[neighbour] = tentative_g_score
+                f_score = tentative_g_score + heuristic(self.state.cell(neighbour), self.goal)
+                self.open_set.push(neighbour, f_score)
 
-        if c + 1 <= self.w and self.graph[r, c + 1] != 1:
-            neighbours.append((r, c + 1))
-
-        return neighbours
+            return self.state.cell(current)
 
     def get_path(self):
         """
         Source: Wikipedia (https://en.wikipedia.org/wiki/A*_search_algorithm)
         Returns the path from goal to start as a list
         """
-        current_node = self.goal
-        total_path = [current_node]
-        while current_node in self.came_from:
-            current_node = self.came_from[current_node]
-            total_path.append(current_node)
-
-        return total_path
+        return self.state.path_to(self.goal_index)
 
     def get_final_output(self):
         """
-        Helper method for getting the path and scores """
-        return self.get_path(), self.g_score, self.closed_set, self.g_score[self.goal]
-
-    def dist(self, node_a, node_b):
-        """
-        Helper method for calculating distance between two points, not very useful if using Manhattan heuristic """
-        return np.sqrt((node_a[0] - node_b[0]) ** 2 + (node_a[1] - node_b[1]) ** 2) * self.graph[node_b[1], node_b[0]]
+        Helper method for getting the path and scores, keyed by (row, column) cells like the rest of the API.
+        Cells that were never reached have a g-score of infinity """
+        cell = self.state.cell
+        g_score = {cell(index): float("inf") if score == UNREACHED else score
+                   for index, score in enumerate(self.state.dist.tolist())}
+        closed_set = {cell(index) for index in np.flatnonzero(self.state.closed).tolist()}
+        return self.get_path(), g_score, closed_set, g_score[self.goal]
 
     @staticmethod
     def get_name():
@@ -139,81 +107,147 @@ class AStar2:
     Alternative (worse) A-star algorithm solver for maze graph
     """
 
-    def __init__(self, graph, start, goal):
+    def __init__(self, graph, start, goal, frontier=BucketQueue):
         """
         Initializing all of the parameters necessary to solve the maze using A star """
         self.graph = graph
         self.start = start
         self.goal = goal
-        self.h, self.w = self.graph.shape
-        self.h -= 1
-        self.w -= 1
-
-        self.frontier = PriorityQueue()
-        self.frontier.put(start, 0)
+        self.adjacency = as_adjacency(graph)
 
-        self.came_from = dict()
-        self.cost_so_far = dict()
+        self.state = SearchState(self.adjacency)
+        self.start_index = self.state.index(start)
+        self.goal_index = self.state.index(goal)
 
-        self.cost_so_far[start] = 0
+        self.frontier = frontier()
+        self.state.dist[self.start_index] = 0
+        self.frontier.push(self.start_index, heuristic(start, goal))
 
     def __next__(self):
         """
         This makes the solver work in a Python generator style fashion, allowing the visualizer to call next until
         None is returned, which signifies that the maze has been solved
         """
-        while not self.frontier.empty():
-            current = self.frontier.get()
+        cost_so_far = self.state.dist
+        while self.frontier:
+            current = self.frontier.pop()
 
-            if current == self.goal:
+            if current == self.goal_index:
                 break
 
-            for next_item in self._get_neighbours(current):
-                new_cost = self.cost_so_far[current] + 1
-                if next_item not in self.cost_so_far or new_cost < self.cost_so_far[next_item]:
-                    self.cost_so_far[next_item] = new_cost
-                    priority = new_cost + heuristic(self.goal, next_item)
-                    self.frontier.put(next_item, priority)
-                    self.came_from[next_item] = current
+            current_cost = int(cost_so_far[current])
+            weights = self.adjacency.weights
+            costs = UNIT_COSTS if weights is None else weights[current]
+            for next_item, cost in zip(self.adjacency.neighbours[current], costs):
+                new_cost = current_cost + cost
+                if cost_so_far[next_item] == UNREACHED or new_cost < cost_so_far[next_item]:
+                    cost_so_far[next_item] = new_cost
+                    priority = new_cost + heuristic(self.goal, self.state.cell(next_item))
+                    self.frontier.push(next_item, priority)
+                    self.state.parent[next_item] = current
 
-            return current
+            return self.state.cell(current)
 
     def __iter__(self):
         return self
 
-    def _get_neighbours(self, current):
+    def get_path(self):
         """
-        A simple method to fetch the allowed neighbours of a given location in the maze """
-        r, c = current
-        neighbours = []
+        Source: Wikipedia (https://en.wikipedia.org/wiki/A*_search_algorithm)
+        Returns the path from goal to start as a list
+        """
+        return self.state.path_to(self.goal_index)
 
-        if r - 1 >= 0 and self.graph[r - 1, c] != 1:
-            neighbours.append((r - 1, c))
+    @staticmethod
+    def get_name():
+        return "A* (alternative)"
 
-        if r + 1 <= self.h and self.graph[r + 1, c] != 1:
-            neighbours.append((r + 1, c))
 
-        if c - 1 >= 0 and self.graph[r, c - 1] != 1:
-            neighbours.append((r, c - 1))
+class BidirectionalAStar:
+    """
+    Bidirectional A-star solver for maze graph.
+    One search runs from the start towards the goal and one from the goal towards the start, the one with the smaller
+    open set is expanded on every step. With consistent heuristics the best connection found so far is optimal as
+    soon as it is no longer than the larger of the two smallest f-scores.
+    """
 
-        if c + 1 <= self.w and self.graph[r, c + 1] != 1:
-            neighbours.append((r, c + 1))
+    def __init__(self, graph, start, goal, frontier=IndexedHeap):
+        """
+        Initializing all of the parameters necessary to solve the maze using bidirectional A star """
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.adjacency = as_adjacency(graph)
 
-        return neighbours
+        self.forward = SearchState(self.adjacency)
+        self.backward = SearchState(self.adjacency)
+        self.start_index = self.forward.index(start)
+        self.goal_index = self.forward.index(goal)
 
-    def get_path(self):
+        self.forward_open = frontier()
+        self.backward_open = frontier()
+        self.forward.dist[self.start_index] = 0
+        self.backward.dist[self.goal_index] = 0
+        self.forward_open.push(self.start_index, heuristic(start, goal))
+        self.backward_open.push(self.goal_index, heuristic(goal, start))
+
+        # Best connection found so far: the cell where the searches met and the length of the path through it
+        self.meeting = self.start_index if self.start_index == self.goal_index else None
+        self.best = 0 if self.meeting is not None else None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
         """
-        Source: Wikipedia (https://en.wikipedia.org/wiki/A*_search_algorithm)
-        Returns the path from goal to start as a list
+        This makes the solver work in a Python generator style fashion, allowing the visualizer to call next until
+        None is returned, which signifies that the maze has been solved
         """
-        current_node = self.goal
-        total_path = [current_node]
-        while current_node in self.came_from:
-            current_node = self.came_from[current_node]
-            total_path.append(current_node)
+        if not self.forward_open or not self.backward_open:
+            return None
+
+        bound = max(self.forward_open.min_priority(), self.backward_open.min_priority())
+        if self.best is not None and self.best <= bound:
+            return None
+
+        if len(self.forward_open) <= len(self.backward_open):
+            open_set, state, other, target = self.forward_open, self.forward, self.backward, self.goal
+        else:
+            open_set, state, other, target = self.backward_open, self.backward, self.forward, self.start
+
+        g_score = state.dist
+        closed = state.closed
+        current = open_set.pop()
+        closed[current] = True
+
+        current_g_score = int(g_score[current])
+        weights = self.adjacency.weights
+        costs = UNIT_COSTS if weights is None else weights[current]
+        for neighbour, cost in zip(self.adjacency.neighbours[current], costs):
+            if closed[neighbour]:
+                continue
+
+            tentative_g_score = current_g_score + cost
+            if g_score[neighbour] == UNREACHED or tentative_g_score < g_score[neighbour]:
+                state.parent[neighbour] = current
+                g_score[neighbour] = tentative_g_score
+                open_set.push(neighbour, tentative_g_score + heuristic(state.cell(neighbour), target))
+
+            if other.dist[neighbour] != UNREACHED:
+                length = int(g_score[neighbour]) + int(other.dist[neighbour])
+                if self.best is None or length < self.best:
+                    self.best = length
+                    self.meeting = neighbour
+
+        return state.cell(current)
 
-        return total_path
+    def get_path(self):
+        """
+        Returns the path from goal to start as a list """
+        if self.meeting is None:
+            return [self.goal]
+        return meeting_path(self.forward, self.backward, self.meeting)
 
     @staticmethod
     def get_name():
-        return "A* (alternative)"
+        return "Bidirectional A*"
@@ -0,0 +1,126 @@
+import numpy as np
+
+# Bits of the open-direction mask, in the order the neighbours are listed
+NORTH = 1
+SOUTH = 2
+WEST = 4
+EAST = 8
+
+# Step costs of a graph without weights, zipped with a neighbour row of up to four cells
+UNIT_COSTS = (1, 1, 1, 1)
+
+
+class Adjacency:
+    """
+    Neighbour table of a maze, built once and shared by every solver working on it.
+    Cells are addressed by their flat index r * w + c.
+
+    It keeps two arrays with one byte per cell: open, the walkable cells it was built from, and mask, a 4-bit
+    open-direction mask per cell. The same graph in CSR form (indptr/indices) and neighbours[i], the CSR row of
+    cell i as a tuple, which is what the solvers read in their inner loops, are only built the first time they
+    are asked for.
+    Every step on the grid costs 1, so weights is None. Weighted graphs such as ContractedGraph set weights[i] to
+    the costs of the steps in neighbours[i].
+    """
+
+    weights = None
+
+    def __init__(self, open_cells):
+        """
+        Building the table from a boolean array that is True for every cell that can be walked on """
+        open_cells = np.asarray(open_cells, dtype=np.bool_)
+        self.open = open_cells
+        self.shape = open_cells.shape
+        self.h, self.w = self.shape
+        self.size = self.h * self.w
+
+        mask = np.zeros(self.shape, dtype=np.uint8)
+        vertical = open_cells[1:, :] & open_cells[:-1, :]
+        horizontal = open_cells[:, 1:] & open_cells[:, :-1]
+        mask[1:, :] |= vertical * np.uint8(NORTH)
+        mask[:-1, :] |= vertical * np.uint8(SOUTH)
+        mask[:, 1:] |= horizontal * np.uint8(WEST)
+        mask[:, :-1] |= horizontal * np.uint8(EAST)
+        self.mask = mask.ravel()
+
+        self._indptr = None
+        self._indices = None
+        self._neighbours = None
+
+    @property
+    def indptr(self):
+        if self._indptr is None:
+            self._build_csr()
+        return self._indptr
+
+    @property
+    def indices(self):
+        if self._indices is None:
+            self._build_csr()
+        return self._indices
+
+    @property
+    def neighbours(self):
+        if self._neighbours is None:
+            indices = self.indices.tolist()
+            indptr = self.indptr.tolist()
+            self._neighbours = [tuple(indices[indptr[i]:indptr[i + 1]]) for i in range(self.size)]
+        return self._neighbours
+
+    def _build_csr(self):
+        flat = np.arange(self.size, dtype=np.int32)
+        candidates = np.stack((flat - self.w, flat + self.w, flat - 1, flat + 1), axis=1)
+        allowed = np.stack([(self.mask & bit) != 0 for bit in (NORTH, SOUTH, WEST, EAST)], axis=1)
+
+        self._indices = candidates[allowed]
+        self._indptr = np.zeros(self.size + 1, dtype=np.int32)
+        np.cumsum(allowed.sum(axis=1), out=self._indptr[1:])
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Builds the table from a maze grid, where 1 marks a wall """
+        return cls(np.asarray(grid) != 1)
+
+    def index(self, cell):
+        """
+        Converts a (row, column) tuple into a flat index """
+        return cell[0] * self.w + cell[1]
+
+    def cell(self, index):
+        """
+        Converts a flat index into a (row, column) tuple """
+        return divmod(int(index), self.w)
+
+    def degree(self, index):
+        return bin(int(self.mask[index])).count('1')
+
+
+def as_adjacency(graph):
+    """
+    Lets the solvers accept either a prebuilt neighbour table or a plain maze grid """
+    if isinstance(graph, np.ndarray):
+        return Adjacency.from_grid(graph)
+    return graph
+
+
+def as_unit_adjacency(graph):
+    """
+    as_adjacency for the solvers that count steps instead of adding up weights, they would find wrong paths on a
+    weighted graph such as ContractedGraph, so it is rejected """
+    adjacency = as_adjacency(graph)
+    if adjacency.weights is not None:
+        raise ValueError('%s only works on graphs where every step costs 1, use a weighted solver'
+                         % type(adjacency).__name__)
+    return adjacency
+
+
+def as_grid_adjacency(graph):
+    """
+    as_adjacency for the solvers that read the grid geometry (the direction masks or the open cells) instead of
+    the neighbour rows, anything but a grid or an Adjacency is rejected """
+    adjacency = as_adjacency(graph)
+    if not isinstance(adjacency, Adjacency):
+        raise ValueError('%s has no grid geometry, this solver only works on a maze grid or an Adjacency'
+                         % type(adjacency).__name__)
+    return adjacency
@@ -1,7 +1,6 @@
 from __future__ import absolute_import
 from maze_gen_algo import MazeGenAlgo
 from maze_gen_algo import np
-from random import choice, randrange
 
 
 class AldousBroder(MazeGenAlgo):
@@ -14,8 +13,8 @@ class AldousBroder(MazeGenAlgo):
     3. Repeat step 2 until all cells have been visited.
     """
 
-    def __init__(self, h, w):
-        super(AldousBroder, self).__init__(h, w)
+    def __init__(self, h, w, seed=None):
+        super(AldousBroder, self).__init__(h, w, seed)
 
     def generate(self):
         # create empty grid, with walls
@@ -23,8 +22,8 @@ class AldousBroder(MazeGenAlgo):
         a.fill(1)
         grid = a
 
-        crow = randrange(1, self.H, 2)
-        ccol = randrange(1, self.W, 2)
+        crow = self.rng.randrange(1, self.H, 2)
+        ccol = self.rng.randrange(1, self.W, 2)
         grid[crow][ccol] = 0
         num_visited = 1
 
@@ -35,7 +34,7 @@ class AldousBroder(MazeGenAlgo):
             # how many neighbors have already been visited?
             if len(neighbors) == 0:
                 # mark random neighbor as current
-                (crow, ccol) = choice(self._find_neighbors(crow, ccol, grid))
+                (crow, ccol) = self.rng.choice(self._find_neighbors(crow, ccol, grid))
                 continue
 
             # loop through neighbors
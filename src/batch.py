@@ -0,0 +1,83 @@
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from wavefront import Wavefront, descend
+
+# Total number of cells the distance fields of a batch have to cover before a process pool pays for starting up
+PARALLEL_MIN_CELLS = 1000000
+
+# Walkable cells of the maze, set once in every worker process of the pool
+_worker_open_cells = None
+
+
+def _init_worker(open_cells):
+    global _worker_open_cells
+    _worker_open_cells = open_cells
+
+
+def _solve_group(open_cells, source, targets):
+    """
+    Computes one distance field from the source and reads the path to every target from it.
+    Returns the paths from each target to the source, None for targets that can't be reached """
+    wavefront = Wavefront(open_cells, source)
+    dist = wavefront.run()
+    return [descend(dist, target) for target in targets]
+
+
+def _solve_group_in_worker(group):
+    source, targets = group
+    return _solve_group(_worker_open_cells, source, targets)
+
+
+def group_queries(queries):
+    """
+    Groups (start, goal) queries by a shared source. Paths in a maze can be walked both ways, so every query is
+    served from whichever of its two cells is the endpoint of more queries.
+    Returns a dict of source -> list of (query position, target, reversed) """
+    counts = Counter()
+    for start, goal in queries:
+        counts[start] += 1
+        counts[goal] += 1
+
+    groups = {}
+    for position, (start, goal) in enumerate(queries):
+        if counts[goal] > counts[start]:
+            groups.setdefault(goal, []).append((position, start, True))
+        else:
+            groups.setdefault(start, []).append((position, goal, False))
+
+    return groups
+
+
+def solve_batch(maze, queries, processes=None):
+    """
+    Solves many (start, goal) queries on one maze.
+    Queries that share a source share a single distance field, and independent groups are spread over a process
+    pool once there is enough work for it (processes=1 keeps everything in this process, any other number always
+    uses a pool). Returns the paths in the order of the queries, each from goal to start like the solvers'
+    get_path, or None where the goal can't be reached.
+    """
+    open_cells = maze.get_open_cells()
+    groups = group_queries(queries)
+    work = [(source, [target for _, target, _ in members]) for source, members in groups.items()]
+
+    small = processes is None and len(work) * open_cells.size < PARALLEL_MIN_CELLS
+    if processes == 1 or len(work) < 2 or small:
+        results = [_solve_group(open_cells, source, targets) for source, targets in work]
+    else:
+        processes = processes or os.cpu_count() or 1
+        chunksize = max(1, len(work) // (4 * processes))
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(open_cells,)) as executor:
+            results = list(executor.map(_solve_group_in_worker, work, chunksize=chunksize))
+
+    paths = [None] * len(queries)
+    for members, group_paths in zip(groups.values(), results):
+        for (position, _, flipped), path in zip(members, group_paths):
+            # A field from the goal gives the path from start to goal, turn it around
+            if path is not None and flipped:
+                path.reverse()
+            paths[position] = path
+
+    return paths
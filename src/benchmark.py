@@ -0,0 +1,69 @@
+"""
+Times the maze generators at growing sizes. Run it from this directory:
+
+    python benchmark.py [generator name ...] [--sizes 10 20 40] [--repeat 3]
+
+Without names it compares Aldous-Broder and Wilson, which sample the same uniform distribution. Every run is
+checked to be a perfect maze, and the best time of the repeats is reported.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from adjacency import Adjacency
+from aldous_broder import AldousBroder
+from binary_tree import BinaryTree
+from eller import Eller
+from kruskal import Kruskal
+from prims import Prims
+from recursive_division import RecursiveDivision
+from sidewinder import Sidewinder
+from tiled import Tiled
+from tree_index import TreeIndex
+from wilson import Wilson
+
+generators = [AldousBroder, Wilson, Prims, Kruskal, BinaryTree, Sidewinder, Eller, RecursiveDivision, Tiled]
+
+
+def time_generator(generator, size, repeat):
+    """
+    Returns the best time to generate a size x size maze out of repeat runs """
+    best = None
+    for run in range(repeat):
+        algorithm = generator(size, size, seed=run)
+        started = time.perf_counter()
+        grid = algorithm.generate()
+        elapsed = time.perf_counter() - started
+
+        # Every open cell has to be in a single tree, TreeIndex itself rejects loops
+        tree = TreeIndex(Adjacency.from_grid(grid))
+        if len(np.unique(tree.component[tree.adjacency.open.ravel()])) != 1:
+            raise AssertionError('%s did not produce a perfect maze' % generator.get_name())
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Times the maze generators at growing sizes.')
+    parser.add_argument('names', nargs='*', default=[AldousBroder.get_name(), Wilson.get_name()],
+                        help='generators to compare, the first one is the baseline')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 20, 40, 80, 160])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    by_name = {generator.get_name(): generator for generator in generators}
+    selected = [by_name[name] for name in args.names]
+
+    print('%8s' % 'size' + ''.join('%20s' % generator.get_name() for generator in selected) + '%10s' % 'speedup')
+    for size in args.sizes:
+        times = [time_generator(generator, size, args.repeat) for generator in selected]
+        speedup = times[0] / times[-1] if times[-1] else float('inf')
+        print('%8s' % ('%dx%d' % (size, size)) + ''.join('%19.4fs' % t for t in times) + '%9.1fx' % speedup)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
 from collections import deque
 
+from adjacency import as_unit_adjacency
+from search_state import SearchState, UNREACHED, meeting_path
+
 
 class BFS:
     """
@@ -12,13 +15,14 @@ class BFS:
         self.graph = graph
         self.start = start
         self.goal = goal
-        self.h, self.w = self.graph.shape
-        self.h -= 1
-        self.w -= 1
+        self.adjacency = as_unit_adjacency(graph)
+
+        self.state = SearchState(self.adjacency)
+        self.start_index = self.state.index(start)
+        self.goal_index = self.state.index(goal)
 
-        self.queue = deque([(start, 0)])
-        self.came_from = dict()
-        self.came_from[start] = None
+        self.queue = deque([self.start_index])
+        self.state.dist[self.start_index] = 0
 
     def __iter__(self):
         return self
@@ -28,52 +32,106 @@ class BFS:
         This makes the solver work in a Python generator style fashion, allowing the visualizer to call next until
         None is returned, which signifies that the maze has been solved
         """
+        dist = self.state.dist
         while self.queue:
-            vertex, val = self.queue.popleft()
+            vertex = self.queue.popleft()
 
-            if vertex == self.goal:
+            if vertex == self.goal_index:
                 break
 
-            for next_item in self._get_neighbours(vertex):
-                if next_item not in self.came_from:
-                    self.came_from[next_item] = vertex
-                    self.queue.append((next_item, val + 1))
+            val = int(dist[vertex]) + 1
+            for next_item in self.adjacency.neighbours[vertex]:
+                if dist[next_item] == UNREACHED:
+                    dist[next_item] = val
+                    self.state.parent[next_item] = vertex
+                    self.queue.append(next_item)
+
+            return self.state.cell(vertex)
+
+    def get_path(self):
+        """
+        Returns the path from goal to start as a list """
+        return self.state.path_to(self.goal_index)
+
+    @staticmethod
+    def get_name():
+        return "Breadth-first search"
 
-            return vertex
 
-    def _get_neighbours(self, current):
+class BidirectionalBFS:
+    """
+    Bidirectional breadth-first search solver for maze graph.
+    One frontier grows from the start and one from the goal, the smaller one is expanded on every step
+    """
+
+    def __init__(self, graph, start, goal):
         """
-        A simple method to fetch the allowed neighbours of a given location in the maze """
-        r, c = current
-        neighbours = []
+        Initializing all of the parameters necessary to solve the maze using bidirectional BFS """
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.adjacency = as_unit_adjacency(graph)
 
-        if r - 1 >= 0 and self.graph[r - 1, c] != 1:
-            neighbours.append((r - 1, c))
+        self.forward = SearchState(self.adjacency)
+        self.backward = SearchState(self.adjacency)
+        self.start_index = self.forward.index(start)
+        self.goal_index = self.forward.index(goal)
 
-        if r + 1 <= self.h and self.graph[r + 1, c] != 1:
-            neighbours.append((r + 1, c))
+        self.forward_queue = deque([self.start_index])
+        self.backward_queue = deque([self.goal_index])
+        self.forward.dist[self.start_index] = 0
+        self.backward.dist[self.goal_index] = 0
 
-        if c - 1 >= 0 and self.graph[r, c - 1] != 1:
-            neighbours.append((r, c - 1))
+        # Best connection found so far: the cell where the frontiers met and the length of the path through it
+        self.meeting = self.start_index if self.start_index == self.goal_index else None
+        self.best = 0 if self.meeting is not None else None
 
-        if c + 1 <= self.w and self.graph[r, c + 1] != 1:
-            neighbours.append((r, c + 1))
+    def __iter__(self):
+        return self
 
-        return neighbours
+    def __next__(self):
+        """
+        This makes the solver work in a Python generator style fashion, allowing the visualizer to call next until
+        None is returned, which signifies that the maze has been solved
+        """
+        if not self.forward_queue or not self.backward_queue:
+            return None
+
+        forward_top = self.forward.dist[self.forward_queue[0]]
+        backward_top = self.backward.dist[self.backward_queue[0]]
+        # No connection through the unexpanded cells can be shorter than the best one any more
+        if self.best is not None and forward_top + backward_top >= self.best:
+            return None
+
+        if len(self.forward_queue) <= len(self.backward_queue):
+            queue, state, other = self.forward_queue, self.forward, self.backward
+        else:
+            queue, state, other = self.backward_queue, self.backward, self.forward
+
+        dist = state.dist
+        vertex = queue.popleft()
+        val = int(dist[vertex]) + 1
+        for next_item in self.adjacency.neighbours[vertex]:
+            if dist[next_item] == UNREACHED:
+                dist[next_item] = val
+                state.parent[next_item] = vertex
+                queue.append(next_item)
+
+                if other.dist[next_item] != UNREACHED:
+                    length = val + int(other.dist[next_item])
+                    if self.best is None or length < self.best:
+                        self.best = length
+                        self.meeting = next_item
+
+        return state.cell(vertex)
 
     def get_path(self):
         """
         Returns the path from goal to start as a list """
-        current_node = self.goal
-        total_path = [current_node]
-
-        while current_node in self.came_from:
-            current_node = self.came_from[current_node]
-            if current_node is not None:
-                total_path.append(current_node)
-
-        return total_path
+        if self.meeting is None:
+            return [self.goal]
+        return meeting_path(self.forward, self.backward, self.meeting)
 
     @staticmethod
     def get_name():
-        return "Breadth-first search"
+        return "Bidirectional BFS"
@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+from maze_gen_algo import MazeGenAlgo
+from maze_gen_algo import np
+
+
+class BinaryTree(MazeGenAlgo):
+    """
+    Every cell opens the wall to its north or to its east, chosen by a coin flip. Cells on the top row can only go
+    east and cells on the right column can only go north, which leaves one long corridor along each of them.
+
+    Each coin flip only depends on its own cell, so the whole grid is carved at once with NumPy masks.
+    """
+
+    def __init__(self, h, w, seed=None):
+        super(BinaryTree, self).__init__(h, w, seed)
+
+    def generate(self):
+        # create empty grid, with every cell open
+        a = np.empty((self.H, self.W), dtype=np.int8)
+        a.fill(1)
+        grid = a
+        grid[1:-1:2, 1:-1:2] = 0
+
+        north = self.np_rng.integers(0, 2, size=(self.h, self.w), dtype=np.uint8).view(np.bool_)
+        north[:, -1] = True
+        north[0, :] = False
+        east = ~north
+        east[:, -1] = False
+
+        # the wall north of cell (r, c) is at (2r, 2c + 1) and the wall east of it at (2r + 1, 2c + 2),
+        # a wall stays where the cell did not open it
+        grid[0:-2:2, 1:-1:2] = ~north
+        grid[1:-1:2, 2::2] = ~east
+
+        return grid
+
+    @staticmethod
+    def get_name():
+        return "Binary Tree"
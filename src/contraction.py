@@ -0,0 +1,208 @@
+import copy
+
+import numpy as np
+
+NOT_A_NODE = -1
+
+
+class ContractedGraph:
+    """
+    Junction graph of a maze: every run of cells with exactly two open neighbours is contracted into one weighted
+    edge between the junctions and dead ends at its ends. Corners are contracted too, so the edge weight is the
+    number of steps along the corridor.
+
+    It offers the same interface as Adjacency (size, index, cell, neighbours, weights), so the weighted solvers
+    (Dijkstra, AStar, AStar2 and BidirectionalAStar) run on it unchanged. BFS and DFS count steps and would take
+    a long corridor for a single one, they refuse the graph. The start and goal of a query usually lie inside
+    a corridor, with_endpoints adds them as nodes, and expand turns a solver's node path back into a cell path.
+    """
+
+    def __init__(self, adjacency, keep=()):
+        """
+        Contracting the corridors of the adjacency. Cells in keep always become nodes """
+        self.adjacency = adjacency
+        self.shape = adjacency.shape
+        self.w = adjacency.w
+        neighbours = adjacency.neighbours
+        degree = np.diff(adjacency.indptr)
+
+        is_node = adjacency.open.ravel() & (degree != 2)
+        for cell in keep:
+            if cell is not None:
+                is_node[adjacency.index(cell)] = True
+
+        self.node_of = np.full(adjacency.size, NOT_A_NODE, dtype=np.int32)
+        self.node_cells = np.flatnonzero(is_node).tolist()
+        self.node_of[self.node_cells] = np.arange(len(self.node_cells), dtype=np.int32)
+
+        # Corridors are stored once, as (first node, last node, flat cells strictly between them)
+        self.corridor_of = np.full(adjacency.size, NOT_A_NODE, dtype=np.int32)
+        self.offset_of = np.zeros(adjacency.size, dtype=np.int32)
+        self.corridors = []
+
+        node_of = self.node_of
+        position = 0
+        while True:
+            while position < len(self.node_cells):
+                self._walk_corridors(position, neighbours, is_node)
+                position += 1
+
+            # Closed loops of corridor cells have no junction, one of their cells becomes a node
+            left_over = np.flatnonzero(adjacency.open.ravel() & ~is_node & (self.corridor_of == NOT_A_NODE))
+            if len(left_over) == 0:
+                break
+            cell = int(left_over[0])
+            is_node[cell] = True
+            node_of[cell] = len(self.node_cells)
+            self.node_cells.append(cell)
+
+        # Only the shortest of several parallel corridors between two nodes is needed for an edge
+        links = {}
+        for corridor_id, (first, last, cells) in enumerate(self.corridors):
+            if first == last:
+                continue
+            for pair in ((first, last), (last, first)):
+                if pair not in links or len(cells) < len(self.corridors[links[pair]][2]):
+                    links[pair] = corridor_id
+        self.links = links
+        self.query_links = {}
+
+        self.neighbours = [[] for _ in self.node_cells]
+        self.weights = [[] for _ in self.node_cells]
+        for (first, last), corridor_id in links.items():
+            self.neighbours[first].append(last)
+            self.weights[first].append(len(self.corridors[corridor_id][2]) + 1)
+        self.neighbours = [tuple(row) for row in self.neighbours]
+        self.weights = [tuple(row) for row in self.weights]
+        self.size = len(self.node_cells)
+        self.extra_nodes = {}
+
+    def _walk_corridors(self, node, neighbours, is_node):
+        """
+        Follows every corridor leaving the node that has not been walked from its other end yet """
+        start = self.node_cells[node]
+        for first_step in neighbours[start]:
+            if is_node[first_step]:
+                # Two adjacent nodes, the corridor between them is empty
+                if start < first_step:
+                    self.corridors.append((node, int(self.node_of[first_step]), []))
+                continue
+            if self.corridor_of[first_step] != NOT_A_NODE:
+                continue
+
+            cells = []
+            previous, current = start, first_step
+            while not is_node[current]:
+                cells.append(current)
+                a, b = neighbours[current]
+                previous, current = current, (b if a == previous else a)
+
+            self.corridor_of[cells] = len(self.corridors)
+            self.offset_of[cells] = np.arange(len(cells), dtype=np.int32)
+            self.corridors.append((node, int(self.node_of[current]), cells))
+
+    def index(self, cell):
+        """
+        Converts a (row, column) tuple into a node index, the cell has to be a node """
+        flat = cell[0] * self.w + cell[1]
+        node = int(self.node_of[flat])
+        if node == NOT_A_NODE:
+            node = self.extra_nodes.get(flat, NOT_A_NODE)
+        if node == NOT_A_NODE:
+            raise ValueError('%s is not a node of the contracted graph, add it with with_endpoints' % (cell,))
+        return node
+
+    def cell(self, index):
+        """
+        Converts a node index into a (row, column) tuple """
+        return divmod(self.node_cells[int(index)], self.w)
+
+    def with_endpoints(self, *cells):
+        """
+        Returns a copy of the graph where the given cells are nodes too.
+        A cell inside a corridor is linked to both ends of it (and to another new node in the same corridor),
+        the contracted graph itself is left untouched, so it can serve any number of queries """
+        graph = copy.copy(self)
+        graph.node_cells = list(self.node_cells)
+        graph.neighbours = list(self.neighbours)
+        graph.weights = list(self.weights)
+        graph.extra_nodes = dict(self.extra_nodes)
+        graph.query_links = dict(self.query_links)
+
+        for cell in cells:
+            graph._add_endpoint(cell)
+
+        graph.size = len(graph.node_cells)
+        return graph
+
+    def _add_endpoint(self, cell):
+        flat = cell[0] * self.w + cell[1]
+        if self.node_of[flat] != NOT_A_NODE or flat in self.extra_nodes:
+            return
+        corridor_id = int(self.corridor_of[flat])
+        if corridor_id == NOT_A_NODE:
+            raise ValueError('%s is not an open cell of the maze' % (cell,))
+
+        node = len(self.node_cells)
+        self.node_cells.append(flat)
+        self.neighbours.append(())
+        self.weights.append(())
+
+        first, last, cells = self.corridors[corridor_id]
+        offset = int(self.offset_of[flat])
+        self._link(node, first, cells[offset - 1::-1] if offset else [])
+        self._link(node, last, cells[offset + 1:])
+
+        # Endpoints already placed in the same corridor are reached without passing a corridor end
+        for other_flat, other in self.extra_nodes.items():
+            if self.corridor_of[other_flat] == corridor_id:
+                other_offset = int(self.offset_of[other_flat])
+                if other_offset > offset:
+                    self._link(node, other, cells[offset + 1:other_offset])
+                else:
+                    self._link(node, other, cells[offset - 1:other_offset:-1])
+
+        self.extra_nodes[flat] = node
+
+    def _link(self, a, b, cells):
+        """
+        Adds an edge in both directions, cells are the flat cells strictly between a and b going from a to b """
+        existing = self.query_links.get((a, b))
+        if existing is not None and len(existing) <= len(cells):
+            return
+
+        weight = len(cells) + 1
+        for source, target in ((a, b), (b, a)):
+            row = self.neighbours[source]
+            if existing is None:
+                self.neighbours[source] = row + (target,)
+                self.weights[source] += (weight,)
+            else:
+                # Both ends of a looping corridor are the same node, keep the shorter way round
+                position = row.index(target)
+                weights = self.weights[source]
+                self.weights[source] = weights[:position] + (weight,) + weights[position + 1:]
+        self.query_links[(a, b)] = cells
+        self.query_links[(b, a)] = cells[::-1]
+
+    def _cells_between(self, a, b):
+        cells = self.query_links.get((a, b))
+        if cells is not None:
+            return cells
+
+        first, last, cells = self.corridors[self.links[(a, b)]]
+        return cells if first == a else cells[::-1]
+
+    def expand(self, path):
+        """
+        Turns a path of node cells, as returned by a solver's get_path, back into the full path of maze cells """
+        if not path:
+            return path
+
+        total_path = [path[0]]
+        for a_cell, b_cell in zip(path, path[1:]):
+            for flat in self._cells_between(self.index(a_cell), self.index(b_cell)):
+                total_path.append(divmod(flat, self.w))
+            total_path.append(b_cell)
+
+        return total_path
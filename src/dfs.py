@@ -1,3 +1,6 @@
+from adjacency import as_unit_adjacency
+from search_state import SearchState, UNREACHED
+
 
 class DFS:
     """
@@ -10,14 +13,14 @@ class DFS:
         self.graph = graph
         self.start = start
         self.goal = goal
-        self.h, self.w = self.graph.shape
-        self.h -= 1
-        self.w -= 1
+        self.adjacency = as_unit_adjacency(graph)
+
+        self.state = SearchState(self.adjacency)
+        self.start_index = self.state.index(start)
+        self.goal_index = self.state.index(goal)
 
-        self.stack = [(start, 0)]
-        self.came_from = dict()
-        self.came_from[start] = None
-        self.visited = []
+        self.stack = [self.start_index]
+        self.state.dist[self.start_index] = 0
 
     def __iter__(self):
         return self
@@ -27,52 +30,28 @@ class DFS:
         This makes the solver work in a Python generator style fashion, allowing the visualizer to call next until
         None is returned, which signifies that the maze has been solved
         """
+        dist = self.state.dist
+        visited = self.state.closed
         while self.stack:
-            vertex, val = self.stack.pop()
-            self.visited.append(vertex)
+            vertex = self.stack.pop()
+            visited[vertex] = True
 
-            if vertex == self.goal:
+            if vertex == self.goal_index:
                 break
 
-            for next_item in self._get_neighbours(vertex):
-                if next_item not in self.came_from and next_item not in self.visited:
-                    self.came_from[next_item] = vertex
-                    self.stack.append((next_item, val + 1))
-
-            return vertex
-
-    def _get_neighbours(self, current):
-        """
-        A simple method to fetch the allowed neighbours of a given location in the maze """
-        r, c = current
-        neighbours = []
-
-        if r - 1 >= 0 and self.graph[r - 1, c] != 1:
-            neighbours.append((r - 1, c))
+            val = int(dist[vertex]) + 1
+            for next_item in self.adjacency.neighbours[vertex]:
+                if dist[next_item] == UNREACHED and not visited[next_item]:
+                    dist[next_item] = val
+                    self.state.parent[next_item] = vertex
+                    self.stack.append(next_item)
 
-        if r + 1 <= self.h and self.graph[r + 1, c] != 1:
-            neighbours.append((r + 1, c))
-
-        if c - 1 >= 0 and self.graph[r, c - 1] != 1:
-            neighbours.append((r, c - 1))
-
-        if c + 1 <= self.w and self.graph[r, c + 1] != 1:
-            neighbours.append((r, c + 1))
-
-        return neighbours
+            return self.state.cell(vertex)
 
     def get_path(self):
         """
         Returns the path from goal to start as a list """
-        current_node = self.goal
-        total_path = [current_node]
-
-        while current_node in self.came_from:
-            current_node = self.came_from[current_node]
-            if current_node is not None:
-                total_path.append(current_node)
-
-        return total_path
+        return self.state.path_to(self.goal_index)
 
     @staticmethod
     def get_name():
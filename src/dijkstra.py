@@ -1,4 +1,6 @@
-import queue as Q
+from frontier import BucketQueue
+from adjacency import as_adjacency, UNIT_COSTS
+from search_state import SearchState, ShortestPathTree, UNREACHED
 
 class Dijkstra:
     """
@@ -6,26 +8,22 @@ class Dijkstra:
     https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
     """
     
-    def __init__(self, graph, start, goal):
+    def __init__(self, graph, start, goal=None, frontier=BucketQueue):
         """
-        Initializing all of the parameters necessary to solve the maze using Dijkstra """
+        Initializing all of the parameters necessary to solve the maze using Dijkstra.
+        The goal can be left out when the solver is only used through solve_all """
         self.graph = graph
         self.start = start
         self.goal = goal
-        self.h, self.w = self.graph.shape
-        self.h -= 1
-        self.w -= 1
-        
-        #More
-        self.came_from = dict()
-        
-        #self.current = start
-        #http://www.bogotobogo.com/python/python_PriorityQueue_heapq_Data_Structure.php
-        self.queue = Q.PriorityQueue()
-        self.queue.put((0, start))
-        
-        self.visited = []
-        self.unvisited = [] 
+        self.adjacency = as_adjacency(graph)
+
+        self.state = SearchState(self.adjacency)
+        self.start_index = self.state.index(start)
+        self.goal_index = None if goal is None else self.state.index(goal)
+
+        self.queue = frontier()
+        self.state.dist[self.start_index] = 0
+        self.queue.push(self.start_index, 0)
         
     def __iter__(self):
         return self
@@ -35,75 +33,60 @@ class Dijkstra:
         This makes the solver work in a Python generator style fashion, allowing the visualizer to call next until
         None is returned, which signifies that the maze has been solved
         """
-        while not self.queue.empty():
-            a, current = self.queue.get()
-            if current in self.visited:
+        visited = self.state.closed
+        while self.queue:
+            current = self.queue.pop()
+            if visited[current]:
                 continue
-            else:
-                self.visited.append(current)
-                
-            if current == self.goal:
+
+            if current == self.goal_index:
+                # Leave the goal queued, so that solve_all can still continue from here
+                self.queue.push(current, int(self.state.dist[current]))
                 break
-            
-            min_len = self._length_of_path(current) + 1
-            for next_item in self._get_neighbours(current):
-                if next_item in self.visited:
-                    continue
-                if not next_item in self.came_from:
-                    self.came_from[next_item] = current
-                    self.queue.put((min_len, next_item))
-                else:
-                    if self._length_of_path(next_item) > min_len:
-                        self.came_from[next_item] = self.current
-                    
-                        if not next_item in self.visited:
-                            self.queue.put((min_len, next_item))
-            
-            return current
-            
-    def _get_neighbours(self, current):
-        """
-        A simple method to fetch the allowed neighbours of a given location in the maze """
-        r, c = current
-        neighbours = []
 
-        if r - 1 >= 0 and self.graph[r - 1, c] != 1:
-            neighbours.append((r - 1, c))
+            visited[current] = True
+            self._relax(current)
 
-        if r + 1 <= self.h and self.graph[r + 1, c] != 1:
-            neighbours.append((r + 1, c))
+            return self.state.cell(current)
 
-        if c - 1 >= 0 and self.graph[r, c - 1] != 1:
-            neighbours.append((r, c - 1))
+    def solve_all(self):
+        """
+        Runs the search until every reachable cell is settled and returns the resulting ShortestPathTree.
+        Paths and distances to any goal can then be read from the tree without another search """
+        visited = self.state.closed
+        while self.queue:
+            current = self.queue.pop()
+            if visited[current]:
+                continue
 
-        if c + 1 <= self.w and self.graph[r, c + 1] != 1:
-            neighbours.append((r, c + 1))
+            visited[current] = True
+            self._relax(current)
 
-        return neighbours
-    
-    def _length_of_path(self, c_start):
-        
-        if (c_start == self.start):
-            return 0
-        cntr = 1
-        c = self.came_from[c_start]
-        while(c != self.start):
-            cntr += 1
-            c = self.came_from[c]
-            
-        return cntr
+        return ShortestPathTree(self.state, self.start)
+
+    def _relax(self, current):
+        """
+        Updates the distances and parents of the unsettled neighbours of a settled cell """
+        dist = self.state.dist
+        visited = self.state.closed
+        current_len = int(dist[current])
+        weights = self.adjacency.weights
+        costs = UNIT_COSTS if weights is None else weights[current]
+        for next_item, cost in zip(self.adjacency.neighbours[current], costs):
+            if visited[next_item]:
+                continue
+            min_len = current_len + cost
+            if dist[next_item] == UNREACHED or min_len < dist[next_item]:
+                dist[next_item] = min_len
+                self.state.parent[next_item] = current
+                self.queue.push(next_item, min_len)
     
     def get_path(self):
         """
         Source: Wikipedia (https://en.wikipedia.org/wiki/A*_search_algorithm)
         Returns the path from goal to start as a list
         """
-        current_node = self.goal
-        total_path = [current_node]
-        while current_node in self.came_from:
-            current_node = self.came_from[current_node]
-            total_path.append(current_node)        
-        return total_path
+        return self.state.path_to(self.goal_index)
     
     @staticmethod
     def get_name():
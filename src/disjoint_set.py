@@ -0,0 +1,66 @@
+class DisjointSet:
+    """
+    Union-find over the integers 0..n-1, stored in two flat lists.
+    find uses path halving and union joins by rank, so any sequence of operations runs in near-constant amortized
+    time per operation.
+    """
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+        self.sets = n
+
+    def find(self, item):
+        """
+        Returns the representative of the set holding the item """
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        """
+        Merges the sets holding a and b. Returns False if they were already in the same set """
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+
+        rank = self.rank
+        if rank[a] < rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        self.sets -= 1
+        return True
+
+    def union_edges(self, firsts, seconds):
+        """
+        Runs union over the pairs (firsts[i], seconds[i]) in order, the way Kruskal's algorithm walks its edge list.
+        Returns the positions of the pairs that merged two sets, and stops early once everything is one set """
+        parent = self.parent
+        rank = self.rank
+        merged = []
+        for position, (a, b) in enumerate(zip(firsts, seconds)):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b:
+                continue
+
+            if rank[a] < rank[b]:
+                a, b = b, a
+            parent[b] = a
+            if rank[a] == rank[b]:
+                rank[a] += 1
+            merged.append(position)
+            self.sets -= 1
+            if self.sets == 1:
+                break
+
+        return merged
@@ -0,0 +1,81 @@
+from __future__ import absolute_import
+from maze_gen_algo import MazeGenAlgo
+from maze_gen_algo import np
+from disjoint_set import DisjointSet
+
+
+class Eller(MazeGenAlgo):
+    """
+    Eller's algorithm builds the maze one row at a time and only remembers which set each cell of the current row
+    belongs to, so finished rows can be streamed out and never looked at again.
+
+    1. Give every cell of the row that has no set yet a set of its own.
+    2. Randomly join neighbouring cells of different sets, opening the wall between them.
+    3. Open the wall south of at least one random cell of every set, those cells carry their set to the next row.
+    4. On the last row, join every pair of neighbouring cells of different sets.
+
+    With a filename the grid is an np.memmap backed by that file, written two grid rows at a time, so the memory
+    used does not grow with the height of the maze.
+    """
+
+    def __init__(self, h, w, seed=None, filename=None):
+        super(Eller, self).__init__(h, w, seed)
+        self.filename = filename
+
+    def generate(self):
+        if self.filename is None:
+            grid = np.empty((self.H, self.W), dtype=np.int8)
+        else:
+            grid = np.memmap(self.filename, dtype=np.int8, mode='w+', shape=(self.H, self.W))
+        grid[0, :] = 1
+
+        w = self.w
+        random = self.rng.random
+        # sets of the cells in the current row, a set id is always the column of one of its cells
+        sets = list(range(w))
+        rows = np.empty((2, self.W), dtype=np.int8)
+
+        for row in range(self.h):
+            last_row = row == self.h - 1
+            rows.fill(1)
+            rows[0, 1:-1:2] = 0
+
+            # join neighbouring cells of different sets
+            joined = DisjointSet(w)
+            for col in range(w - 1):
+                if (last_row or random() < 0.5) and joined.union(sets[col], sets[col + 1]):
+                    rows[0, 2 * col + 2] = 0
+            sets = [joined.find(s) for s in sets]
+
+            if not last_row:
+                # every set goes down through at least one of its cells, chosen at random
+                members = {}
+                for col, s in enumerate(sets):
+                    members.setdefault(s, []).append(col)
+                down = [random() < 0.5 for _ in range(w)]
+                for cols in members.values():
+                    if not any(down[col] for col in cols):
+                        down[cols[int(random() * len(cols))]] = True
+
+                # cells that did not go down start a new set on the next row, ids of sets that died are reused
+                carried = set(sets[col] for col in range(w) if down[col])
+                free = [s for s in range(w) if s not in carried]
+                next_sets = []
+                for col in range(w):
+                    if down[col]:
+                        next_sets.append(sets[col])
+                        rows[1, 2 * col + 1] = 0
+                    else:
+                        next_sets.append(free.pop())
+                sets = next_sets
+
+            grid[2 * row + 1:2 * row + 3, :] = rows
+
+        if self.filename is not None:
+            grid.flush()
+
+        return grid
+
+    @staticmethod
+    def get_name():
+        return "Eller"
@@ -0,0 +1,189 @@
+"""
+Records solver runs without a display, as a PNG sequence or an animated GIF. Run it from this directory:
+
+    python export.py out.gif --generator Kruskal --size 30 30 --seed 1 --solvers "A*" "Breadth-first search"
+
+Frames are rendered by the solving thread and compressed by a background encoder thread, so solving and encoding
+overlap. A path ending in .gif makes a GIF, anything else is a directory that gets frame_00000.png, ...
+"""
+import argparse
+import os
+import threading
+from queue import Queue
+
+import numpy as np
+from PIL import GifImagePlugin
+
+from a_star import AStar
+from kruskal import Kruskal
+from maze import Maze
+from registry import maze_generators, solvers
+from scheduler import StepScheduler
+from visual_grid import VisualGrid, WALL, palette_image
+
+
+class FrameEncoder:
+    """
+    Background thread that turns frames of state codes into images on disk.
+    Frames are handed over through a bounded queue, so a solver that runs ahead of the encoder waits instead of
+    piling up frames in memory. Image compression releases the GIL, which lets it overlap with solving.
+    GIF frames are appended to the file as they arrive, each one cropped to the part that changed since the
+    previous frame, so nothing is left to encode once solving is done. The state codes are already palette
+    indexes, so frames are written as they are, without any colour conversion.
+    """
+
+    def __init__(self, path, duration=40, queue_size=8):
+        """
+        path ending in .gif writes an animated GIF, any other path is a directory for a PNG sequence.
+        duration is the time each GIF frame is shown, in milliseconds """
+        self.path = path
+        self.gif = path.lower().endswith('.gif')
+        self.duration = duration
+        self.frames = 0
+        self._queue = Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._previous = None
+
+        if not self.gif:
+            os.makedirs(path, exist_ok=True)
+        self._thread.start()
+
+    def put(self, frame):
+        """
+        Queues a frame, an (h, w) uint8 array of state codes that is not changed afterwards """
+        if self._error is not None:
+            raise self._error
+        self._queue.put(frame)
+
+    def close(self):
+        """
+        Waits for every queued frame to be written and finishes the file """
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        gif_file = None
+        closed = False
+        try:
+            if self.gif:
+                gif_file = open(self.path, 'wb')
+            while True:
+                frame = self._queue.get()
+                if frame is None:
+                    closed = True
+                    break
+                if self.gif:
+                    self._write_gif_frame(gif_file, frame)
+                else:
+                    palette_image(frame).save(os.path.join(self.path, 'frame_%05d.png' % self.frames))
+                self.frames += 1
+
+            if gif_file is not None and self.frames:
+                gif_file.write(b';')
+        except Exception as error:
+            self._error = error
+            # Keep draining until close, so the solving thread never blocks on a full queue
+            while not closed:
+                closed = self._queue.get() is None
+        finally:
+            if gif_file is not None:
+                gif_file.close()
+
+    def _write_gif_frame(self, gif_file, indexed):
+        if self._previous is None:
+            header, _ = GifImagePlugin.getheader(palette_image(indexed), info={'loop': 0, 'duration': self.duration})
+            # The loop entry of info makes the header carry the extension that loops the animation forever
+            for chunk in header:
+                gif_file.write(chunk)
+            top, bottom, left, right = 0, indexed.shape[0], 0, indexed.shape[1]
+        else:
+            changed = indexed != self._previous
+            rows = np.flatnonzero(changed.any(axis=1))
+            if len(rows) == 0:
+                # Nothing changed, the frame still has to be shown for its duration
+                top, bottom, left, right = 0, 1, 0, 1
+            else:
+                cols = np.flatnonzero(changed.any(axis=0))
+                top, bottom, left, right = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+
+        region = palette_image(indexed[top:bottom, left:right])
+        for chunk in GifImagePlugin.getdata(region, offset=(int(left), int(top)), duration=self.duration):
+            gif_file.write(chunk)
+        self._previous = indexed
+
+
+def compose_frame(visual_grids, scale):
+    """
+    Puts the views of the solvers side by side, with a one cell gap, and scales every cell up to scale x scale
+    pixels """
+    views = []
+    for visual_grid in visual_grids:
+        if views:
+            views.append(np.full((visual_grid.state.shape[0], 1), WALL, dtype=np.uint8))
+        views.append(visual_grid.state)
+    frame = np.concatenate(views, axis=1)
+    return np.repeat(np.repeat(frame, scale, axis=0), scale, axis=1)
+
+
+def export_run(maze, solver_classes, path, every=1, scale=4, duration=40, queue_size=8):
+    """
+    Solves the maze with every solver class at once, the way the UI does, and records every k-th step and the
+    final state. Returns the number of frames written """
+    visual_grids = [VisualGrid(maze) for _ in solver_classes]
+    active_solvers = [solver(maze.get_adjacency(), maze.start, maze.end) for solver in solver_classes]
+    views = dict(zip(active_solvers, visual_grids))
+
+    def paint_step(solver, new_elem):
+        views[solver].paint_step(new_elem)
+
+    def paint_solution(solver):
+        views[solver].paint_solution(solver.get_path())
+
+    scheduler = StepScheduler(active_solvers, paint_step, paint_solution)
+    encoder = FrameEncoder(path, duration, queue_size)
+    try:
+        encoder.put(compose_frame(visual_grids, scale))
+        steps = 0
+        while not scheduler.finished():
+            scheduler.step_once()
+            steps += 1
+            if steps % every == 0:
+                encoder.put(compose_frame(visual_grids, scale))
+        if steps % every != 0:
+            encoder.put(compose_frame(visual_grids, scale))
+    finally:
+        encoder.close()
+
+    return encoder.frames
+
+
+def main():
+    generators_by_name = {generator.get_name(): generator for generator in maze_generators}
+    solvers_by_name = {solver.get_name(): solver for solver in solvers}
+
+    parser = argparse.ArgumentParser(description='Records solver runs as a PNG sequence or an animated GIF.')
+    parser.add_argument('path', help='output .gif file, or a directory for PNG frames')
+    parser.add_argument('--generator', default=Kruskal.get_name(), choices=sorted(generators_by_name))
+    parser.add_argument('--size', nargs=2, type=int, default=[30, 30], metavar=('HEIGHT', 'WIDTH'))
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--solvers', nargs='+', default=[AStar.get_name()], choices=sorted(solvers_by_name))
+    parser.add_argument('--every', type=int, default=1, help='record every k-th step')
+    parser.add_argument('--scale', type=int, default=4, help='pixels per grid cell')
+    parser.add_argument('--duration', type=int, default=40, help='milliseconds per GIF frame')
+    args = parser.parse_args()
+
+    maze = Maze()
+    maze.generator = generators_by_name[args.generator](args.size[0], args.size[1], seed=args.seed)
+    maze.generate()
+    maze.generate_entrances()
+
+    frames = export_run(maze, [solvers_by_name[name] for name in args.solvers], args.path,
+                        every=max(1, args.every), scale=max(1, args.scale), duration=args.duration)
+    print('%d frames written to %s' % (frames, args.path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+class IndexedHeap:
+    """
+    Binary min-heap with an item -> position index, which allows decrease-key in O(log n).
+    Items must be hashable, priorities only need to be comparable.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._position = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return len(self._heap) != 0
+
+    def __contains__(self, item):
+        return item in self._position
+
+    def empty(self):
+        return len(self._heap) == 0
+
+    def priority(self, item):
+        """
+        Returns the current priority of an item in the heap """
+        return self._heap[self._position[item]][0]
+
+    def min_priority(self):
+        """
+        Returns the lowest priority in the heap without removing anything """
+        return self._heap[0][0]
+
+    def push(self, item, priority):
+        """
+        Inserts the item, or lowers its priority if it is already queued with a higher one.
+        Returns True if the heap was changed """
+        position = self._position.get(item)
+        if position is None:
+            self._heap.append([priority, item])
+            self._position[item] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return True
+
+        if priority < self._heap[position][0]:
+            self._heap[position][0] = priority
+            self._sift_up(position)
+            return True
+
+        return False
+
+    def pop(self):
+        """
+        Removes and returns the item with the lowest priority """
+        heap = self._heap
+        last = heap.pop()
+        del self._position[last[1]]
+        if not heap:
+            return last[1]
+
+        top = heap[0]
+        heap[0] = last
+        self._position[last[1]] = 0
+        self._sift_down(0)
+        del self._position[top[1]]
+        return top[1]
+
+    def _sift_up(self, position):
+        heap = self._heap
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if heap[parent][0] <= entry[0]:
+                break
+            heap[position] = heap[parent]
+            self._position[heap[position][1]] = position
+            position = parent
+
+        heap[position] = entry
+        self._position[entry[1]] = position
+
+    def _sift_down(self, position):
+        heap = self._heap
+        size = len(heap)
+        entry = heap[position]
+        child = 2 * position + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if entry[0] <= heap[child][0]:
+                break
+            heap[position] = heap[child]
+            self._position[heap[position][1]] = position
+            position = child
+            child = 2 * position + 1
+
+        heap[position] = entry
+        self._position[entry[1]] = position
+
+
+class BucketQueue:
+    """
+    Monotone bucket queue for small non-negative integer priorities, as found on unit-cost grids.
+    Push and decrease-key are O(1), pop is amortized O(1) as long as priorities mostly grow.
+    Buckets are LIFO, so ties are broken in favour of the most recently pushed item.
+    """
+
+    def __init__(self):
+        self._buckets = []
+        self._priority = {}
+        self._cursor = 0
+
+    def __len__(self):
+        return len(self._priority)
+
+    def __bool__(self):
+        return len(self._priority) != 0
+
+    def __contains__(self, item):
+        return item in self._priority
+
+    def empty(self):
+        return len(self._priority) == 0
+
+    def priority(self, item):
+        """
+        Returns the current priority of an item in the queue """
+        return self._priority[item]
+
+    def min_priority(self):
+        """
+        Returns the lowest priority in the queue without removing anything """
+        if not self._priority:
+            raise IndexError('min_priority of an empty bucket queue')
+
+        bucket = self._buckets[self._cursor]
+        while not bucket or self._priority.get(bucket[-1]) != self._cursor:
+            if bucket:
+                bucket.pop()
+            else:
+                self._cursor += 1
+                bucket = self._buckets[self._cursor]
+        return self._cursor
+
+    def push(self, item, priority):
+        """
+        Inserts the item, or lowers its priority if it is already queued with a higher one.
+        Returns True if the queue was changed """
+        current = self._priority.get(item)
+        if current is not None and current <= priority:
+            return False
+
+        # The old entry stays in its bucket and is skipped once popped
+        self._priority[item] = priority
+        while len(self._buckets) <= priority:
+            self._buckets.append([])
+        self._buckets[priority].append(item)
+        if priority < self._cursor:
+            self._cursor = priority
+        return True
+
+    def pop(self):
+        """
+        Removes and returns the item with the lowest priority """
+        if not self._priority:
+            raise IndexError('pop from an empty bucket queue')
+
+        buckets = self._buckets
+        while True:
+            bucket = buckets[self._cursor]
+            while bucket:
+                item = bucket.pop()
+                if self._priority.get(item) == self._cursor:
+                    del self._priority[item]
+                    return item
+            self._cursor += 1
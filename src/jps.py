@@ -1,6 +1,12 @@
-from queue import PriorityQueue
 import numpy as np
-from math import floor
+
+from frontier import IndexedHeap
+from adjacency import as_grid_adjacency, NORTH, SOUTH, WEST, EAST
+from search_state import SearchState, UNREACHED, NO_PARENT
+
+# Directions are numbered like the bits of the adjacency mask: north, south, west, east
+DIRECTION_BITS = (NORTH, SOUTH, WEST, EAST)
+ALL_DIRECTIONS = (0, 1, 2, 3)
 
 
 def heuristic(a, b):
@@ -11,134 +17,241 @@ def heuristic(a, b):
     return abs(r1 - r2) + abs(c1 - c2)
 
 
+class JumpTable:
+    """
+    JPS+ preprocessing of a maze.
+    For every cell and direction it stores how many steps away the next jump point is (0 if a wall comes first)
+    and how many steps can be taken before hitting a wall. It only depends on the maze, so it is built once and
+    lets every later JPS query on that maze jump in O(1).
+    """
+
+    def __init__(self, adjacency):
+        """
+        Building the table with one vectorized sweep per row and column of the maze """
+        self.adjacency = adjacency
+        h, w = adjacency.shape
+        mask = adjacency.mask.reshape(h, w)
+        can = [(mask & bit) != 0 for bit in DIRECTION_BITS]
+        north, south, west, east = can
+
+        jump = np.zeros((4, h, w), dtype=np.int32)
+        wall = np.zeros((4, h, w), dtype=np.int32)
+
+        # A cell entered horizontally is a jump point if it has a vertical neighbour that the previous cell lacks
+        forced_east = np.zeros((h, w), dtype=np.bool_)
+        forced_east[:, 1:] = (north[:, 1:] & ~north[:, :-1]) | (south[:, 1:] & ~south[:, :-1])
+        forced_west = np.zeros((h, w), dtype=np.bool_)
+        forced_west[:, :-1] = (north[:, :-1] & ~north[:, 1:]) | (south[:, :-1] & ~south[:, 1:])
+
+        for c in range(w - 2, -1, -1):
+            self._sweep(jump[3], wall[3], east, forced_east, (slice(None), c), (slice(None), c + 1))
+        for c in range(1, w):
+            self._sweep(jump[2], wall[2], west, forced_west, (slice(None), c), (slice(None), c - 1))
+
+        # A cell entered vertically is a jump point if a horizontal jump from it finds one
+        vertical_jump_point = (jump[2] > 0) | (jump[3] > 0)
+        for r in range(1, h):
+            self._sweep(jump[0], wall[0], north, vertical_jump_point, r, r - 1)
+        for r in range(h - 2, -1, -1):
+            self._sweep(jump[1], wall[1], south, vertical_jump_point, r, r + 1)
+
+        self.jump_distances = jump.reshape(4, -1)
+        self.wall_distances = wall.reshape(4, -1)
+        self.jump = [row.tolist() for row in self.jump_distances]
+        self.wall = [row.tolist() for row in self.wall_distances]
+
+    @staticmethod
+    def _sweep(jump, wall, can_move, is_jump_point, here, ahead):
+        """
+        Fills one row or column of the tables from the already finished row or column ahead of it """
+        step = can_move[here]
+        wall[here] = np.where(step, wall[ahead] + 1, 0)
+        further = np.where(jump[ahead] > 0, jump[ahead] + 1, 0)
+        jump[here] = np.where(step, np.where(is_jump_point[ahead], 1, further), 0)
+
+
 class JPS:
     """
-    Implementation of Jump Point Search - an improvement of A*
+    Implementation of Jump Point Search - an improvement of A* - for 4-connected grids.
+
+    Canonical paths turn vertically as early as possible, so a cell entered horizontally only branches off
+    vertically when it has a forced neighbour (a vertical neighbour the previous cell does not have), and a cell
+    entered vertically is a jump point when a horizontal jump from it finds one. Everything else is jumped over.
+    If a JumpTable of the maze is given, jumps are read from it instead of being scanned.
     """
 
-    def __init__(self, graph, start, goal):
+    def __init__(self, graph, start, goal, frontier=IndexedHeap, jump_table=None):
         """
         Initializing all of the parameters necessary to solve the maze using JPS """
         self.graph = graph
         self.start = start
         self.goal = goal
-        self.h, self.w = self.graph.shape
-        self.h -= 1
-        self.w -= 1
+        self.adjacency = as_grid_adjacency(graph)
+        self.jump_table = jump_table
+
+        self.state = SearchState(self.adjacency)
+        self.start_index = self.state.index(start)
+        self.goal_index = self.state.index(goal)
 
-        self.frontier = PriorityQueue()
-        self.frontier.put(start, 0)
+        w = self.adjacency.w
+        self.deltas = (-w, w, -1, 1)
+        self.masks = self.adjacency.mask.tolist()
 
-        self.came_from = dict()
-        self.cost_so_far = dict()
+        self.frontier = frontier()
+        self.frontier.push(self.start_index, heuristic(start, goal))
 
-        self.cost_so_far[start] = 0
+        self.cost_so_far = self.state.dist
+        self.cost_so_far[self.start_index] = 0
 
     def __next__(self):
         """
         This makes the solver work in a Python generator style fashion, allowing the visualizer to call next until
         None is returned, which signifies that the maze has been solved
-        
-        The Jump Point Search can Jump over straights. In this implementation, the condition of a straight is checked and based on that
-        either a jump is made or the usual a* procedure is carried out. 
+
+        Each step expands one jump point and returns the cells of the jump that led to it.
         """
-        while not self.frontier.empty():
-            current = self.frontier.get()
+        closed = self.state.closed
+        while self.frontier:
+            current = self.frontier.pop()
 
-            if current == self.goal:
+            if current == self.goal_index:
                 break
-            else:
-                if self.is_straight(current):
-                    current = self.preform_straight_jump(current)
-                else:
-                    self.usual_a_star(current)
 
-            return current
+            closed[current] = True
+            for direction in self._directions(current):
+                jump_point = self._jump(current, direction)
+                if jump_point is None or closed[jump_point]:
+                    continue
+
+                new_cost = int(self.cost_so_far[current]) + abs(jump_point - current) // abs(self.deltas[direction])
+                if self.cost_so_far[jump_point] == UNREACHED or new_cost < self.cost_so_far[jump_point]:
+                    self.cost_so_far[jump_point] = new_cost
+                    self.state.parent[jump_point] = current
+                    priority = new_cost + heuristic(self.goal, self.state.cell(jump_point))
+                    self.frontier.push(jump_point, priority)
+
+            return self._segment(current)
 
     def __iter__(self):
         return self
 
-    def usual_a_star(self, current, plen=1):
-        for next_item in self._get_neighbours(current):
-            new_cost = self.cost_so_far[current] + 1
-            if next_item not in self.cost_so_far or new_cost < self.cost_so_far[next_item]:
-                self.cost_so_far[next_item] = new_cost
-                priority = new_cost - floor(plen/2) + heuristic(self.goal, next_item)
-                self.frontier.put(next_item, priority)
-                self.came_from[next_item] = current
-
-    # Performs a check to see, if the neighbors and the point form a line
-    def is_straight(self, current):
-        current_neighbours = self._get_neighbours(current)
-        if (len(current_neighbours) == 2):
-            nei_a = current_neighbours[0]
-            a_x, a_y = nei_a
-            nei_b = current_neighbours[1]
-            b_x, b_y = nei_b
-            if (a_x == b_x or a_y == b_y):
-                return True
-        return False
-
-    def preform_straight_jump(self, current):
-        jump_path = []
-        jump_path.append(current)
-        summer = 1
-        current_p = current
-        while (self.is_straight(current_p) or current_p == self.goal):
-            new_cost = self.cost_so_far[current_p] + 1
-            next_point = self.get_next_in_line(current_p)
-            if next_point not in self.cost_so_far or new_cost < self.cost_so_far[next_point]:
-                self.cost_so_far[next_point] = new_cost
-                self.came_from[next_point] = current_p
-            current_p = next_point
-            jump_path.append(current_p)
-            summer += 1
-        if (current_p != self.goal):
-            # priority = self.cost_so_far[current_p] + heuristic(self.goal, current_p)
-            self.usual_a_star(current_p, summer)
-            # self.frontier.put(current_p, priority)
-        # print("Made a jump of length", summer)
-        return jump_path
-
-    # Assumes, that this is already a line
-    def get_next_in_line(self, current):
-        current_neighbours = self._get_neighbours(current)
-        prev_node = self.came_from[current]
-        if current_neighbours[0] == prev_node:
-            return current_neighbours[1]
-        else:
-            return current_neighbours[0]
+    def _direction_between(self, a, b):
+        """
+        Direction of travel from a to b, the two cells have to be on the same row or column """
+        if abs(b - a) < self.adjacency.w:
+            return 3 if b > a else 2
+        return 1 if b > a else 0
+
+    def _directions(self, current):
+        """
+        Pruned set of directions to explore from a jump point, based on the direction it was entered from """
+        parent = self.state.parent[current]
+        if parent == NO_PARENT:
+            return ALL_DIRECTIONS
+
+        direction = self._direction_between(int(parent), current)
+        if direction < 2:
+            return direction, 2, 3
+
+        directions = [direction]
+        here = self.masks[current]
+        previous = self.masks[current - self.deltas[direction]]
+        if here & NORTH and not previous & NORTH:
+            directions.append(0)
+        if here & SOUTH and not previous & SOUTH:
+            directions.append(1)
+        return directions
 
-    def _get_neighbours(self, current):
+    def _jump(self, current, direction):
         """
-        A simple method to fetch the allowed neighbours of a given location in the maze """
-        r, c = current
-        neighbours = []
+        Returns the next jump point from current in the given direction, or None if there is none """
+        if self.jump_table is not None:
+            return self._table_jump(current, direction)
+        if direction >= 2:
+            return self._scan_horizontal(current, direction)
+        return self._scan_vertical(current, direction)
 
-        if r - 1 >= 0 and self.graph[r - 1, c] != 1:
-            neighbours.append((r - 1, c))
+    def _scan_horizontal(self, current, direction):
+        masks = self.masks
+        bit = DIRECTION_BITS[direction]
+        delta = self.deltas[direction]
+        while masks[current] & bit:
+            previous = masks[current]
+            current += delta
+            if current == self.goal_index:
+                return current
 
-        if r + 1 <= self.h and self.graph[r + 1, c] != 1:
-            neighbours.append((r + 1, c))
+            here = masks[current]
+            if (here & NORTH and not previous & NORTH) or (here & SOUTH and not previous & SOUTH):
+                return current
 
-        if c - 1 >= 0 and self.graph[r, c - 1] != 1:
-            neighbours.append((r, c - 1))
+        return None
 
-        if c + 1 <= self.w and self.graph[r, c + 1] != 1:
-            neighbours.append((r, c + 1))
+    def _scan_vertical(self, current, direction):
+        masks = self.masks
+        bit = DIRECTION_BITS[direction]
+        delta = self.deltas[direction]
+        while masks[current] & bit:
+            current += delta
+            if current == self.goal_index:
+                return current
+
+            if self._scan_horizontal(current, 2) is not None or self._scan_horizontal(current, 3) is not None:
+                return current
+
+        return None
+
+    def _table_jump(self, current, direction):
+        """
+        JPS+ jump: the table gives the next jump point, only the goal has to be checked for separately """
+        table = self.jump_table
+        jump = table.jump[direction][current]
+        reach = jump if jump > 0 else table.wall[direction][current]
+        delta = self.deltas[direction]
+
+        r, c = self.state.cell(current)
+        goal_r, goal_c = self.goal
+        if direction >= 2:
+            if goal_r == r and 0 < (goal_c - c) * delta <= reach:
+                return self.goal_index
+        else:
+            steps = (goal_r - r) * (1 if delta > 0 else -1)
+            if 0 < steps <= reach:
+                crossing = current + steps * delta
+                if goal_c == c:
+                    return crossing
+                # Nothing on the goal's row stops a horizontal jump from the crossing before the goal,
+                # unless the crossing is the jump point itself
+                towards_goal = 3 if goal_c > c else 2
+                if abs(goal_c - c) <= table.wall[towards_goal][crossing]:
+                    return crossing
+
+        if jump > 0:
+            return current + jump * delta
+        return None
+
+    def _segment(self, current):
+        """
+        Cells of the straight jump from the parent of current to current, parent excluded """
+        parent = self.state.parent[current]
+        if parent == NO_PARENT:
+            return [self.state.cell(current)]
 
-        return neighbours
+        parent = int(parent)
+        delta = self.deltas[self._direction_between(parent, current)]
+        return [self.state.cell(cell) for cell in range(parent + delta, current + delta, delta)]
 
     def get_path(self):
         """
-        Source: Wikipedia (https://en.wikipedia.org/wiki/A*_search_algorithm)
-        Returns the path from goal to start as a list
+        Returns the path from goal to start as a list, with the jumps between jump points filled in
         """
-        current_node = self.goal
-        total_path = [current_node]
-        while current_node in self.came_from:
-            current_node = self.came_from[current_node]
-            total_path.append(current_node)
+        current = self.goal_index
+        total_path = [self.goal]
+        while self.state.parent[current] != NO_PARENT:
+            segment = self._segment(current)
+            total_path.extend(reversed(segment[:-1]))
+            current = int(self.state.parent[current])
+            total_path.append(self.state.cell(current))
 
         return total_path
 
@@ -1,7 +1,7 @@
 from __future__ import absolute_import
 from maze_gen_algo import MazeGenAlgo
 from maze_gen_algo import np
-from random import shuffle
+from disjoint_set import DisjointSet
 
 
 class Kruskal(MazeGenAlgo):
@@ -9,53 +9,34 @@ class Kruskal(MazeGenAlgo):
     Based on the work done in theJollySin's maze library https://github.com/theJollySin/mazelib
     """
 
-    def __init__(self, h, w):
-        super(Kruskal, self).__init__(h, w)
+    def __init__(self, h, w, seed=None):
+        super(Kruskal, self).__init__(h, w, seed)
 
     def generate(self):
         # create empty grid
         a = np.empty((self.H, self.W), dtype=np.int8)
         a.fill(1)
         grid = a
-
-        forest = []
-        for row in range(1, self.H - 1, 2):
-            for col in range(1, self.W - 1, 2):
-                forest.append([(row, col)])
-                grid[row][col] = 0
-
-        edges = []
-        for row in range(2, self.H - 1, 2):
-            for col in range(1, self.W - 1, 2):
-                edges.append((row, col))
-        for row in range(1, self.H - 1, 2):
-            for col in range(2, self.W - 1, 2):
-                edges.append((row, col))
-
-        shuffle(edges)
-
-        while len(forest) > 1:
-            ce_row, ce_col = edges[0]
-            edges = edges[1:]
-
-            tree1 = -1
-            tree2 = -1
-
-            if ce_row % 2 == 0:  # even-numbered row: vertical wall
-                tree1 = sum([i if (ce_row - 1, ce_col) in j else 0 for i, j in enumerate(forest)])
-                tree2 = sum([i if (ce_row + 1, ce_col) in j else 0 for i, j in enumerate(forest)])
-            else:  # odd-numbered row: horizontal wall
-                tree1 = sum([i if (ce_row, ce_col - 1) in j else 0 for i, j in enumerate(forest)])
-                tree2 = sum([i if (ce_row, ce_col + 1) in j else 0 for i, j in enumerate(forest)])
-
-            if tree1 != tree2:
-                new_tree = forest[tree1] + forest[tree2]
-                temp1 = list(forest[tree1])
-                temp2 = list(forest[tree2])
-                forest = [x for x in forest if x != temp1]  # faster than forest.remove(temp1)
-                forest = [x for x in forest if x != temp2]
-                forest.append(new_tree)
-                grid[ce_row][ce_col] = 0
+        grid[1:-1:2, 1:-1:2] = 0
+
+        # every wall between two cells, vertical walls first and then horizontal walls, with the cells on both
+        # sides of it numbered row by row
+        cells = np.arange(self.h * self.w).reshape(self.h, self.w)
+        v_rows, v_cols = np.mgrid[2:self.H - 1:2, 1:self.W - 1:2]
+        h_rows, h_cols = np.mgrid[1:self.H - 1:2, 2:self.W - 1:2]
+        wall_rows = np.concatenate((v_rows.ravel(), h_rows.ravel()))
+        wall_cols = np.concatenate((v_cols.ravel(), h_cols.ravel()))
+        firsts = np.concatenate((cells[:-1, :].ravel(), cells[:, :-1].ravel()))
+        seconds = np.concatenate((cells[1:, :].ravel(), cells[:, 1:].ravel()))
+
+        # shuffle the walls
+        order = self.np_rng.permutation(len(firsts))
+
+        forest = DisjointSet(self.h * self.w)
+        merged = forest.union_edges(firsts[order].tolist(), seconds[order].tolist())
+
+        opened = order[merged]
+        grid[wall_rows[opened], wall_cols[opened]] = 0
 
         return grid
 
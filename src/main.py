@@ -1,28 +1,26 @@
 from tkinter import Tk, messagebox
 
 from maze import Maze
-from kruskal import Kruskal
-from prims import Prims
-from aldous_broder import AldousBroder
 from maze_ui import MazeUI
-from a_star import AStar, AStar2
-from bfs import BFS
-from dfs import DFS
-from dijkstra import Dijkstra
-from jps import JPS
+from registry import maze_generators, solvers
+from scheduler import StepScheduler
 
-hard_exit = False
+# Target frame rate of the solver animation
+frames_per_second = 30
+
+# Scheduler of the maze being solved, and the id of the frame waiting in Tk's event queue
+scheduler = None
+pending_frame = None
 
 
 def on_close():
     """
     Handling window close as a prompt."""
-    global hard_exit
-
     # Comment out exit confirmation for ease of testing.
     # if messagebox.askokcancel("Quit", "Do you want to quit?"):
-    #    hard_exit = True
-    hard_exit = True
+    #    root.destroy()
+    cancel_frame()
+    root.destroy()
 
 
 def resize_root_if_needed(root, number_of_solvers):
@@ -45,196 +43,89 @@ def generate_maze(solution_window, maze_generator_name, maze_generator_list):
     # MazeUI initalization
     solution_window.initialize_maze(m)
 
-    # Make entrance and exit into accessible areas
-    solution_window.maze_grid[m.start[0], m.start[1]] = 0
-    solution_window.maze_grid[m.end[0], m.end[1]] = 0
-
     return m
 
 
-def start_solver(root, solution_window, solver):
-    new_elem = next(solver)
-
-    while True:
-        if solution_window.generate_new:
-            # Clear canvas from old maze (?? is it even necessary??) and stop new execution.
-            # solution_window.clear_canvas_for_solver(solver.get_name())
-            solution_window.start = False
-            return
-
-        if hard_exit:
-            break
-
-        root.update()
-
-        # If start hasn't been pressed don't start solving
-        if not solution_window.start:
-            continue
-
-        # If pause is pressed, skip calculation. If next is pressed calculate until next iteration
-        if solution_window.pause:
-            if solution_window.next:
-                solution_window.next = False
-            else:
-                continue
-
-        if new_elem is not None:
-            # Recolor discovery path
-            if type(new_elem) is list:
-                for el in new_elem:
-                    solution_window.recolor_point(solver.get_name(),
-                                          el[0],
-                                          el[1],
-                                          (51, 109, 204))
-            else:
-                    solution_window.recolor_point(solver.get_name(),
-                                          new_elem[0],
-                                          new_elem[1],
-                                          (51, 109, 204))
-            solution_window.update_maze()
+def create_scheduler(solution_window, active_solvers):
+    def paint_step(solver, new_elem):
+        solution_window.visual_grids[solver.get_name()].paint_step(new_elem)
 
-            new_elem = next(solver)
-        else:
-            # Recolor endpoint
-            solution_window.recolor_point(solver.get_name(),
-                                          solution_window.maze.end[0],
-                                          solution_window.maze.end[1],
-                                          (51, 109, 204))
-            solution_window.update_maze()
+    def paint_solution(solver):
+        solution_window.visual_grids[solver.get_name()].paint_solution(solver.get_path())
 
-            path = solver.get_path()
+    # Solver steps are batched into frames, the canvases are only rendered once per frame
+    return StepScheduler(active_solvers, paint_step, paint_solution, fps=frames_per_second)
 
-            # Draw solution
-            solution_window.draw_final_path(solver.get_name(),
-                                            path,
-                                            (53, 165, 24))
-            solution_window.update_maze()
 
-
-def start_solving(root, solution_window, active_solvers):
-    nr_solvers = len(active_solvers)
-
-    new_elems = [None] * nr_solvers
-    for i, solver in enumerate(active_solvers):
-        new_elems[i] = next(solver)
-
-    while True:
-        if solution_window.generate_new:
-            # Clear canvas from old maze (?? is it even necessary??) and stop new execution.
-            # solution_window.clear_canvas_for_solver(solver.get_name())
-            solution_window.start = False
-            return
-
-        if hard_exit:
-            break
-
-        root.update()
-
-        # If start hasn't been pressed don't start solving
-        if not solution_window.start:
-            continue
-
-        # If pause is pressed, skip calculation. If next is pressed calculate until next iteration
-        if solution_window.pause:
-            if solution_window.next:
-                solution_window.next = False
-            else:
-                continue
-
-        for i, new_elem in enumerate(new_elems):
-            solver = active_solvers[i]
-            if new_elem is not None:
-                if type(new_elem) is list:
-                    for el in new_elem:
-                        solution_window.recolor_point(solver.get_name(),
-                                              el[0],
-                                              el[1],
-                                              (51, 109, 204))
-                else:
-                    solution_window.recolor_point(solver.get_name(),
-                                              new_elem[0],
-                                              new_elem[1],
-                                              (51, 109, 204))
-                solution_window.update_maze()
-
-                new_elems[i] = next(solver)
-            else:
-                solution_window.recolor_point(solver.get_name(),
-                                              solution_window.maze.end[0],
-                                              solution_window.maze.end[1],
-                                              (51, 109, 204))
-                solution_window.update_maze()
-
-                path = solver.get_path()
-
-                # Draw solution
-                solution_window.draw_final_path(solver.get_name(),
-                                                path,
-                                                (53, 165, 24))
-                solution_window.update_maze()
-
-
-def generation_and_solution(root, solution_window):
+def schedule_frame(delay):
     """
-    Maze's internal loop for solving and stepping."""
+    Queues the next frame with Tk, unless one is queued already or every solver is done """
+    global pending_frame
+    if pending_frame is None and scheduler is not None and not scheduler.finished():
+        pending_frame = root.after(int(delay * 1000), run_frame)
 
-    global hard_exit
 
-    # Generate maze and its entrances
-    m = Maze()
-    m.generator = AldousBroder(solution_window.maze_width, solution_window.maze_height)
-    m.generate()
-    m.generate_entrances()
+def cancel_frame():
+    global pending_frame
+    if pending_frame is not None:
+        root.after_cancel(pending_frame)
+        pending_frame = None
 
-    # MazeUI initalization
-    solution_window.initialize_maze(m)
 
-    # Make entrance and exit into accessible areas
-    solution_window.maze_grid[m.start[0], m.start[1]] = 0
-    solution_window.maze_grid[m.end[0], m.end[1]] = 0
+def run_frame():
+    """
+    Runs one frame of solver steps and renders it. The next frame is only queued while solving goes on, so a paused,
+    idle or finished maze leaves nothing in the event loop """
+    global pending_frame
+    pending_frame = None
 
-    solver = AStar(solution_window.maze_grid, m.start, m.end)
-    new_elem = next(solver)
+    if not solution_window.start or solution_window.pause:
+        return
 
-    while True:
-        if solution_window.generate_new:
-            # Clear canvas from old maze and stop new execution.
-            # solution_window.canvas.delete("all")
-            solution_window.start = False
-            return
+    if solution_window.instant:
+        scheduler.run_to_completion()
+    else:
+        scheduler.run_frame()
+    solution_window.update_maze()
 
-        if hard_exit:
-            break
+    schedule_frame(scheduler.wait_time())
 
-        root.update()
 
-        # If start hasn't been pressed don't start solving
-        if not solution_window.start:
-            continue
+def on_ui_change():
+    """
+    Called by the UI after every button press, all work is started from here or from queued frames """
+    global scheduler
 
-        # If pause is pressed, skip calculation. If next is pressed calculate until next iteration
-        if solution_window.pause:
-            if solution_window.next:
-                solution_window.next = False
-            else:
-                continue
+    if solution_window.generate_new:
+        # Reset maze generation flag and stop solving the old maze
+        solution_window.generate_new = False
+        solution_window.start = False
+        cancel_frame()
 
-        if new_elem is not None:
-            # Recolor discovery path
-            solution_window.recolor_point(new_elem[0], new_elem[1], (51, 109, 204))
-            solution_window.update_maze()
+        resize_root_if_needed(root, len(solution_window.selected_solver_names))
+        maze = generate_maze(solution_window, solution_window.selected_maze_generator, maze_generators)
 
-            new_elem = next(solver)
-        else:
-            # Recolor endpoint
-            solution_window.recolor_point(m.end[0], m.end[1], (51, 109, 204))
-            solution_window.update_maze()
+        active_solvers = []
 
-            path = solver.get_path()
+        for solver_name, solver in solver_name_dict.items():
+            if solver_name in solution_window.selected_solver_names:
+                init_solver = solver(maze.get_adjacency(), maze.start, maze.end)
+                active_solvers.append(init_solver)
 
-            # Draw solution
-            solution_window.draw_final_path(path, (53, 165, 24))
+        scheduler = create_scheduler(solution_window, active_solvers)
+
+    if scheduler is None or not solution_window.start:
+        return
+
+    # If pause is pressed, stop queuing frames. If next is pressed advance every solver by one step
+    if solution_window.pause:
+        cancel_frame()
+        if solution_window.next:
+            solution_window.next = False
+            scheduler.step_once()
             solution_window.update_maze()
+    else:
+        schedule_frame(0)
 
 
 # Tkinter initalization
@@ -243,12 +134,6 @@ root.geometry("%dx%d" % (520, 625))
 root.resizable(False, False)
 root.protocol("WM_DELETE_WINDOW", on_close)
 
-# List of maze generators
-maze_generators = [AldousBroder, Prims, Kruskal]
-
-# List of solvers
-solvers = [BFS, DFS, Dijkstra, AStar, AStar2, JPS]
-
 # Might be avoided in the future, but atm needed for stupid reasons
 solver_name_dict = {}
 for solver in solvers:
@@ -256,30 +141,7 @@ for solver in solvers:
 
 solution_window = MazeUI(root, maze_generators, solvers)
 
-# External loop
-while True:
-    root.update()
-
-    if hard_exit:
-        break
-
-    if not solution_window.start_solutions:
-        continue
-
-    if solution_window.generate_new:
-        # Reset maze generation flag
-        solution_window.generate_new = False
-
-        # Generate and enable maze solution
-        # generation_and_solution(root, solution_window)
-        resize_root_if_needed(root, len(solution_window.selected_solver_names))
-        maze = generate_maze(solution_window, solution_window.selected_maze_generator, maze_generators)
-
-        active_solvers = []
-
-        for solver_name, solver in solver_name_dict.items():
-            if solver_name in solution_window.selected_solver_names:
-                init_solver = solver(solution_window.maze_grid, maze.start, maze.end)
-                active_solvers.append(init_solver)
+solution_window.on_change = on_ui_change
 
-        start_solving(root, solution_window, active_solvers)
+# Everything runs from Tk's event loop, which sleeps while there is nothing to do
+root.mainloop()
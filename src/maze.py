@@ -1,4 +1,14 @@
-from random import randrange
+import random
+from random import Random
+
+import numpy as np
+
+from adjacency import Adjacency
+from contraction import ContractedGraph
+from jps import JumpTable
+from maze_file import read_maze_file, write_maze_file
+from packed_walls import PackedWalls
+from tree_index import TreeIndex
 
 
 class Maze(object):
@@ -14,15 +24,61 @@ class Maze(object):
         self.grid = None
         self.start = None
         self.end = None
+        self._entrance_rng = None
+        self.header = None
+        self.indexes = {}
+
+    @property
+    def grid(self):
+        """ The (2h + 1) x (2w + 1) grid of the maze, where 1 marks a wall.
+            A maze set from packed walls only expands them into the grid the first time it is read.
+        """
+        if self._grid is None and self._packed_walls is not None:
+            self._grid = self._packed_walls.to_grid()
+        return self._grid
+
+    @grid.setter
+    def grid(self, grid):
+        self._grid = grid
+        self._packed_walls = None
+        self._reset_indexes()
+
+    def _reset_indexes(self):
+        """ Drops the lazily built indexes, they are rebuilt for the new maze on the next call. """
+        self._adjacency = None
+        self._jump_table = None
+        self._contraction = None
+        self._tree_index = None
+
+    def get_packed_walls(self):
+        """ Two-bit-per-cell form of the grid, built on the first call. """
+        if self._packed_walls is None:
+            self._packed_walls = PackedWalls.from_grid(self.grid)
+
+        return self._packed_walls
 
-    def generate(self):
-        """ public method to generate a new maze, and handle some clean-up """
+    def set_packed_walls(self, packed_walls):
+        """ Replaces the maze with packed walls, the grid is only expanded when something reads it. """
+        self._grid = None
+        self._packed_walls = packed_walls
+        self._reset_indexes()
+
+    def generate(self, cache=None):
+        """ public method to generate a new maze, and handle some clean-up.
+            With a MazeCache, a seeded generator's maze is taken from the cache when it has been generated before.
+        """
         if self.generator is None:
             raise UnboundLocalError('No maze-generation algorithm has been set.')
         else:
-            self.grid = self.generator.generate()
+            if cache is None:
+                self.grid = self.generator.generate()
+            else:
+                self.set_packed_walls(cache.get(self.generator))
             self.start = None
             self.end = None
+            # Entrances are drawn from a Random of their own, seeded like the generator, so a seeded maze gets the
+            # same ones on every run, whether it was generated or taken from the cache
+            self._entrance_rng = Random(self.generator.seed)
 
     def generate_entrances(self, start_outer=True, end_outer=True):
         """ Generate maze entrances.
@@ -41,8 +97,94 @@ class Maze(object):
         if abs(self.start[0] - self.end[0]) + abs(self.start[1] - self.end[1]) < 2:
             self.generate_entrances(start_outer, end_outer)
 
+        self._reset_indexes()
+
+    def get_adjacency(self):
+        """ Neighbour table of the maze, with the entrances opened up.
+            It is built on the first call and shared by every solver until the maze changes.
+        """
+        if self._adjacency is None:
+            self._adjacency = Adjacency(self.get_open_cells())
+
+        return self._adjacency
+
+    def get_open_cells(self):
+        """ Boolean array of the cells that can be walked on, the grid's open cells plus the entrances. """
+        open_cells = self.grid != 1
+        for entrance in (self.start, self.end):
+            if entrance is not None:
+                open_cells[entrance] = True
+
+        return open_cells
+
+    def get_jump_table(self):
+        """ JPS+ jump table of the maze, built on the first call.
+            Pass it to JPS to make repeated queries on the same maze jump in O(1).
+        """
+        if self._jump_table is None:
+            self._jump_table = JumpTable(self.get_adjacency())
+
+        return self._jump_table
+
+    def get_contraction(self):
+        """ Junction graph of the maze with its corridors contracted, the start and end are kept as nodes.
+            It is built on the first call, run a solver on it and expand its path back to cells.
+        """
+        if self._contraction is None:
+            self._contraction = ContractedGraph(self.get_adjacency(), keep=(self.start, self.end))
+
+        return self._contraction
+
+    def get_tree_index(self):
+        """ Tree index of a perfect maze, for distance and path queries between any two cells without searching.
+            It is built on the first call, and raises a ValueError if the maze has loops.
+        """
+        if self._tree_index is None:
+            self._tree_index = TreeIndex(self.get_adjacency())
+
+        return self._tree_index
+
+    def save(self, path, indexes=None):
+        """ Save the maze to a binary maze file: the generator name, seed and entrances, the grid, and any
+            precomputed arrays given in indexes (a dict of name -> array, e.g. distance fields or the adjacency mask).
+        """
+        header = {
+            'height': self.grid.shape[0],
+            'width': self.grid.shape[1],
+            'generator': self.generator.get_name() if self.generator is not None else None,
+            'seed': getattr(self.generator, 'seed', None),
+            'start': list(self.start) if self.start is not None else None,
+            'end': list(self.end) if self.end is not None else None,
+        }
+        arrays = dict(indexes or {})
+        arrays['grid'] = np.asarray(self.grid, dtype=np.int8)
+        write_maze_file(path, header, arrays)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """ Load a maze saved with save.
+            With mmap the grid and the indexes are read-only memory maps of the file, which makes loading near-instant
+            and lets processes share one copy. The saved indexes are in maze.indexes, the generator name and seed
+            in maze.header.
+        """
+        header, arrays = read_maze_file(path, mmap)
+        maze = cls()
+        maze.grid = arrays.pop('grid')
+        maze.start = tuple(header['start']) if header['start'] is not None else None
+        maze.end = tuple(header['end']) if header['end'] is not None else None
+        maze.header = header
+        maze.indexes = arrays
+        return maze
+
+    def _entrance_randrange(self):
+        """ randrange of the entrance Random of a generated maze, of the random module for a grid set by hand. """
+        if self._entrance_rng is None:
+            return random.randrange
+        return self._entrance_rng.randrange
+
     def _generate_outer_entrances(self):
         """ Generate maze entrances, along the outer walls. """
+        randrange = self._entrance_randrange()
         H = self.grid.shape[0]
         W = self.grid.shape[1]
 
@@ -64,6 +206,7 @@ class Maze(object):
 
     def _generate_inner_entrances(self):
         """ Generate maze entrances, randomly within the maze. """
+        randrange = self._entrance_randrange()
         H = self.grid.height
         W = self.grid.width
 
@@ -78,6 +221,7 @@ class Maze(object):
 
     def _generate_opposite_entrances(self):
         """ Generate one inner and one outer entrance. """
+        randrange = self._entrance_randrange()
         H = self.grid.height
         W = self.grid.width
 
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from packed_walls import PackedWalls
+
+# Bumped whenever the packed format or a generator changes what a seed produces, which retires old entries
+CACHE_VERSION = 1
+
+
+class MazeCache:
+    """
+    Cache of generated mazes, keyed on (generator, h, w, seed).
+    Mazes are kept as PackedWalls in an in-memory LRU that evicts the least recently used entries once their
+    packed size goes over max_bytes, and as .npy files named by the hash of the key in a directory on disk,
+    so a maze generated by one run is loaded by the next one.
+    Generators without a seed are not reproducible, so they are generated every time and never stored.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024):
+        """
+        Using the given directory for the files, or only the memory if there is none """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._memory = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(generator):
+        """
+        Returns the content address of the maze a seeded generator produces """
+        text = '%d|%s|%d|%d|%r|%r' % (CACHE_VERSION, generator.get_name(), generator.h, generator.w, generator.seed,
+                                      generator.cache_parameters())
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, generator):
+        """
+        Returns the packed walls of the generator's maze, from memory, from disk, or by generating it """
+        if generator.seed is None:
+            return PackedWalls.from_grid(generator.generate())
+
+        key = self.key(generator)
+        packed = self._memory.get(key)
+        if packed is not None:
+            self._memory.move_to_end(key)
+            return packed
+
+        packed = self._load(key, generator.h, generator.w)
+        if packed is None:
+            # The seed names the first maze after seeding, whatever the generator was used for before
+            generator.reseed(generator.seed)
+            packed = PackedWalls.from_grid(generator.generate())
+            self._store(key, packed)
+
+        self._remember(key, packed)
+        return packed
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npy')
+
+    def _load(self, key, h, w):
+        if self.directory is None:
+            return None
+        try:
+            bits = np.load(self._path(key))
+        except (OSError, ValueError):
+            return None
+
+        # A truncated or foreign file is treated as a miss and overwritten
+        if bits.dtype != np.uint8 or bits.shape != ((2 * h * w + 7) // 8,):
+            return None
+        return PackedWalls(h, w, bits)
+
+    def _store(self, key, packed):
+        if self.directory is None:
+            return
+
+        # Written to a temporary file first, so other processes never see half a maze
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                np.save(f, packed.bits)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def _remember(self, key, packed):
+        self._memory[key] = packed
+        self.current_bytes += packed.nbytes
+        while self.current_bytes > self.max_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+
+    def __contains__(self, generator):
+        if generator.seed is None:
+            return False
+        key = self.key(generator)
+        return key in self._memory or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def __len__(self):
+        return len(self._memory)
+
+    def clear(self):
+        """
+        Empties the memory, the files on disk are kept """
+        self._memory.clear()
+        self.current_bytes = 0
@@ -0,0 +1,79 @@
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b'MAZE'
+VERSION = 1
+# Arrays start on 64-byte boundaries, so they can be mapped straight into memory
+ALIGNMENT = 64
+# magic, version, header length
+PREAMBLE = struct.Struct('<4sII')
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_maze_file(path, header, arrays):
+    """
+    Writes a maze file: a fixed preamble, a JSON header and then every array as raw bytes.
+    header is a dict of plain values, arrays a dict of name -> ndarray. The header written to the file also lists
+    the dtype, shape and offset of every array """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+    # The offsets depend on the header length and the header holds the offsets. Longer offsets only make the
+    # header longer, so moving the arrays back until the header fits in front of them always settles
+    layout = {}
+    header = dict(header, arrays=layout)
+    start = 0
+    while True:
+        offset = start
+        for name, array in arrays.items():
+            layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset = _aligned(offset + array.nbytes)
+        needed = _aligned(PREAMBLE.size + len(json.dumps(header).encode('utf-8')))
+        if needed <= start:
+            break
+        start = needed
+    text = json.dumps(header).encode('utf-8')
+    if arrays and PREAMBLE.size + len(text) > min(entry['offset'] for entry in layout.values()):
+        raise ValueError('The header of %s does not fit in front of its arrays.' % path)
+
+    with open(path, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(text)))
+        f.write(text)
+        for name, array in arrays.items():
+            f.write(b'\0' * (layout[name]['offset'] - f.tell()))
+            f.write(array.tobytes())
+
+
+def read_maze_file(path, mmap=True):
+    """
+    Reads a maze file written by write_maze_file. Returns the header and a dict of name -> array.
+    With mmap the arrays are read-only np.memmap views of the file, so opening is instant whatever the size and
+    processes that map the same file share its pages. Raises a ValueError for anything that is not a maze file """
+    with open(path, 'rb') as f:
+        preamble = f.read(PREAMBLE.size)
+        if len(preamble) != PREAMBLE.size:
+            raise ValueError('%s is not a maze file.' % path)
+        magic, version, length = PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ValueError('%s is not a maze file.' % path)
+        if version != VERSION:
+            raise ValueError('%s has maze file version %d, only version %d can be read.' % (path, version, VERSION))
+        header = json.loads(f.read(length).decode('utf-8'))
+
+        arrays = {}
+        for name, entry in header.pop('arrays').items():
+            dtype = np.dtype(entry['dtype'])
+            shape = tuple(entry['shape'])
+            if entry['offset'] < PREAMBLE.size + length:
+                raise ValueError('%s is corrupted, array %s starts inside the header.' % (path, name))
+            if mmap:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=entry['offset'], shape=shape)
+            else:
+                f.seek(entry['offset'])
+                arrays[name] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+    return header, arrays
@@ -1,6 +1,6 @@
 import abc
 import numpy as np
-from random import shuffle
+from random import Random
 
 
 class MazeGenAlgo(object):
@@ -10,13 +10,30 @@ class MazeGenAlgo(object):
 
     __metaclass__ = abc.ABCMeta
 
-    def __init__(self, h, w):
+    def __init__(self, h, w, seed=None):
         if w < 3 or h < 3:
             raise ValueError('A maze smaller than 3x3 is not a maze.')
         self.h = h
         self.w = w
         self.H = (2 * self.h) + 1
         self.W = (2 * self.w) + 1
+        self.reseed(seed)
+
+    def reseed(self, seed):
+        """Give the generator its own random number generators, a Python one for
+        cell-by-cell work and a NumPy one for array work. The same seed always
+        produces the same maze from the next call to generate; without a seed
+        the generators are seeded from the OS.
+        """
+        self.seed = seed
+        self.rng = Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+
+    def cache_parameters(self):
+        """Anything besides the name, size and seed that changes the maze
+        this generator produces, as a tuple. It becomes part of the cache key.
+        """
+        return ()
 
     @abc.abstractmethod
     def generate(self):
@@ -42,6 +59,6 @@ class MazeGenAlgo(object):
         if c < self.W-2 and grid[r][c+2] == is_wall:
             ns.append((r, c+2))
 
-        shuffle(ns)
+        self.rng.shuffle(ns)
 
         return ns
\ No newline at end of file
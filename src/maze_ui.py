@@ -1,8 +1,11 @@
-from tkinter import Frame, Label, Entry, Button, BOTH, Canvas, SE, CENTER, messagebox, StringVar, OptionMenu
+from tkinter import Frame, Label, Entry, Button, BOTH, Canvas, SE, CENTER, messagebox, StringVar, OptionMenu, \
+    BooleanVar, Checkbutton
 from tkinter.ttk import Treeview
-from PIL import Image, ImageOps, ImageTk
+from PIL import ImageTk
 import numpy as np
 
+from visual_grid import VisualGrid, WALL, PALETTE_NAMES, palette_image
+
 
 class MazeUI(Frame):
     """
@@ -26,9 +29,12 @@ class MazeUI(Frame):
         self.start = False
         self.pause = False
         self.next = False
+        self.instant = False
+
+        # Called after every button press that changes the state above
+        self.on_change = None
 
         self.maze = None
-        self.maze_grid = None
         self.visual_grids = {}
         self.photos = {}
 
@@ -41,13 +47,10 @@ class MazeUI(Frame):
         self.canvas_2 = Canvas(self, width=500, height=500)
         self.canvas_2.grid(row=3, column=8, columnspan=3, padx=(4, 4), pady=(5, 5))
 
-        self.canvas_label_0 = None
-        self.canvas_label_1 = None
-        self.canvas_label_2 = None
-
-        self.photo_0 = None
-        self.photo_1 = None
-        self.photo_2 = None
+        self.canvases = [self.canvas_0, self.canvas_1, self.canvas_2]
+        self.canvas_labels = [None, None, None]
+        self.cell_x = None
+        self.cell_y = None
 
         self.__initUI()
 
@@ -108,6 +111,11 @@ class MazeUI(Frame):
         self.next_step = Button(self, text="Next", command=self.__next_step)
         self.next_step.grid(row=5, column=2, pady=(0, 10))
 
+        self.instant_var = BooleanVar(self)
+        self.instant_solution = Checkbutton(self, text="Instant", variable=self.instant_var,
+                                            command=self.__toggle_instant)
+        self.instant_solution.grid(row=2, column=2)
+
     def __select_maze_generator(self, value):
         self.selected_maze_generator = value
 
@@ -152,6 +160,7 @@ class MazeUI(Frame):
             self.initial_canvas.grid_forget()
             self.start_solutions = True
             self.generate_new = True
+            self.__notify()
 
     def __start_solution(self):
         """
@@ -159,6 +168,7 @@ class MazeUI(Frame):
         if self.start_solutions:
             self.start = True
             self.pause = False
+            self.__notify()
 
     def __pause_solution(self):
         """
@@ -166,103 +176,76 @@ class MazeUI(Frame):
         if self.start_solutions:
             self.pause = True
             self.start = True
+            self.__notify()
 
     def __next_step(self):
         """
         Pressing next has no meaning if solving isn't paused."""
         if self.start_solutions:
             self.next = True
+            self.__notify()
+
+    def __toggle_instant(self):
+        """
+        In instant mode the solvers run to completion and only the final state is drawn."""
+        self.instant = self.instant_var.get()
+        self.__notify()
+
+    def __notify(self):
+        if self.on_change is not None:
+            self.on_change()
 
     def initialize_maze(self, maze):
         self.maze = maze
-        self.maze_grid = np.copy(maze.grid)
         self.create_visual_grids(maze)
+        self.create_canvas_images()
         self.update_maze()
 
     def create_visual_grids(self, maze):
+        self.visual_grids = {}
         for solver_name in self.selected_solver_names:
-            invert_bw_grid = 1 - maze.grid
+            self.visual_grids[solver_name] = VisualGrid(maze)
 
-            # Scale the numbers to 255 and create RGB channels
-            visual_grid = np.stack((invert_bw_grid.astype('uint8') * 255,
-                                    invert_bw_grid.astype('uint8') * 255,
-                                    invert_bw_grid.astype('uint8') * 255),
-                                   axis=2)
-
-            self.visual_grids[solver_name] = np.copy(visual_grid)
-            self.paint_entrances(solver_name, maze.start, maze.end)
-
-    def paint_entrances(self, solver_name, start, end):
-        # Start to red
-        self.recolor_point(solver_name, start[0], start[1], (255, 53, 22))
-
-        # End to green
-        self.recolor_point(solver_name, end[0], end[1], (2, 255, 32))
-
-    def recolor_point(self, solver_name, r, c, rgb_values):
-        self.visual_grids[solver_name][r][c][0] = rgb_values[0]
-        self.visual_grids[solver_name][r][c][1] = rgb_values[1]
-        self.visual_grids[solver_name][r][c][2] = rgb_values[2]
-
-    def draw_final_path(self, solver_name, path, rgb_values):
-        for point in path:
-            self.recolor_point(solver_name, point[0], point[1], rgb_values)
+    def create_canvas_images(self):
+        """
+        Paints the whole maze once into one image per solver and puts it on the solver's canvas.
+        Later frames only repaint the cells that changed, directly in that image """
+        h, w = self.maze.grid.shape[:2]
+        ratio = float(480) / max(h, w)
+        new_h, new_w = int(h * ratio), int(w * ratio)
+
+        # Pixel edges of every row and column of cells, cell (r, c) covers [x[c], x[c + 1]) x [y[r], y[r + 1])
+        self.cell_y = ((np.arange(h + 1) * new_h) // h + (480 - new_h) // 2).tolist()
+        self.cell_x = ((np.arange(w + 1) * new_w) // w + (480 - new_w) // 2).tolist()
+        heights = np.diff(self.cell_y)
+        widths = np.diff(self.cell_x)
+
+        for canvas, solver_name in zip(self.canvases, self.selected_solver_names):
+            scaled = np.repeat(np.repeat(self.visual_grids[solver_name].state, heights, axis=0), widths, axis=1)
+            frame = np.full((480, 480), WALL, dtype=np.uint8)
+            frame[self.cell_y[0]:self.cell_y[-1], self.cell_x[0]:self.cell_x[-1]] = scaled
+
+            canvas.delete('all')
+            self.photos[solver_name] = ImageTk.PhotoImage(palette_image(frame))
+            canvas.create_image(500, 500, image=self.photos[solver_name], anchor=SE)
+            self.visual_grids[solver_name].take_dirty_cells()
+
+    def recolor_point(self, solver_name, r, c, state):
+        self.visual_grids[solver_name].recolor_point(r, c, state)
+
+    def draw_final_path(self, solver_name, path, state):
+        self.visual_grids[solver_name].draw_final_path(path, state)
 
     def update_maze(self):
-        nr_solvers = len(self.selected_solver_names)
-
-        solver_name_0 = self.selected_solver_names[0]
-        pil_image = Image.fromarray(self.visual_grids[solver_name_0])
-
-        old_size = pil_image.size
-        ratio = float(480) / max(old_size)
-        new_size = tuple([int(x * ratio) for x in old_size])
-        pil_image = pil_image.resize(new_size)
-        scaled_image = Image.new("RGB", (480, 480))
-        scaled_image.paste(pil_image,
-                           ((480 - new_size[0]) // 2, (480 - new_size[1]) // 2))
-
-        self.photo_0 = ImageTk.PhotoImage(scaled_image)
-        self.canvas_0.create_image(500, 500, image=self.photo_0, anchor=SE)
-
-        if self.canvas_label_0 is None:
-            self.canvas_label_0 = Label(self, text=solver_name_0, font='Helvetica 9 bold')
-            self.canvas_label_0.grid(row=4, column=0, columnspan=3, padx=(4, 4), pady=(0, 5))
-
-        if nr_solvers > 1:
-            solver_name_1 = self.selected_solver_names[1]
-            pil_image = Image.fromarray(self.visual_grids[solver_name_1])
-
-            old_size = pil_image.size
-            ratio = float(480) / max(old_size)
-            new_size = tuple([int(x * ratio) for x in old_size])
-            pil_image = pil_image.resize(new_size)
-            scaled_image = Image.new("RGB", (480, 480))
-            scaled_image.paste(pil_image,
-                               ((480 - new_size[0]) // 2, (480 - new_size[1]) // 2))
-
-            self.photo_1 = ImageTk.PhotoImage(scaled_image)
-            self.canvas_1.create_image(500, 500, image=self.photo_1, anchor=SE)
-
-            if self.canvas_label_1 is None:
-                self.canvas_label_1 = Label(self, text=solver_name_1, font='Helvetica 9 bold')
-                self.canvas_label_1.grid(row=4, column=4, columnspan=3, padx=(4, 4), pady=(0, 5))
-
-        if nr_solvers > 2:
-            solver_name_2 = self.selected_solver_names[2]
-            pil_image = Image.fromarray(self.visual_grids[solver_name_2])
-
-            old_size = pil_image.size
-            ratio = float(480) / max(old_size)
-            new_size = tuple([int(x * ratio) for x in old_size])
-            pil_image = pil_image.resize(new_size)
-            scaled_image = Image.new("RGB", (480, 480))
-            scaled_image.paste(pil_image,
-                               ((480 - new_size[0]) // 2, (480 - new_size[1]) // 2))
-
-            self.photo_2 = ImageTk.PhotoImage(scaled_image)
-            self.canvas_2.create_image(500, 500, image=self.photo_2, anchor=SE)
-
-            if self.canvas_label_2 is None:
-                self.canvas_label_2 = Label(self, text=solver_name_2, font='Helvetica 9 bold')
-                self.canvas_label_2.grid(row=4, column=8, columnspan=3, padx=(4, 4), pady=(0, 5))
+        """
+        Repaints the cells that changed since the last frame, the cost depends on their number, not on the maze """
+        for i, solver_name in enumerate(self.selected_solver_names[:len(self.canvases)]):
+            photo = str(self.photos[solver_name])
+            state = self.visual_grids[solver_name].state
+            for r, c in self.visual_grids[solver_name].take_dirty_cells():
+                self.tk.call(photo, 'put', PALETTE_NAMES[state[r, c]],
+                             '-to', self.cell_x[c], self.cell_y[r], self.cell_x[c + 1], self.cell_y[r + 1])
+
+            if self.canvas_labels[i] is None:
+                self.canvas_labels[i] = Label(self, text=solver_name, font='Helvetica 9 bold')
+                self.canvas_labels[i].grid(row=4, column=4 * i, columnspan=3, padx=(4, 4), pady=(0, 5))
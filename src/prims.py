@@ -1,7 +1,6 @@
 from __future__ import absolute_import
 from maze_gen_algo import MazeGenAlgo
 from maze_gen_algo import np
-from random import randrange
 
 
 class Prims(MazeGenAlgo):
@@ -17,8 +16,8 @@ class Prims(MazeGenAlgo):
     4. Repeat steps 2 and 3 until V includes every cell in G.
     """
 
-    def __init__(self, h, w):
-        super(Prims, self).__init__(h, w)
+    def __init__(self, h, w, seed=None):
+        super(Prims, self).__init__(h, w, seed)
 
     def generate(self):
         # create empty grid
@@ -26,30 +25,58 @@ class Prims(MazeGenAlgo):
         a.fill(1)
         grid = a
 
+        # cells are numbered row by row, the frontier is a list with swap-remove and two bitmaps
+        h, w = self.h, self.w
+        randrange = self.rng.randrange
+        visited = bytearray(h * w)
+        in_frontier = bytearray(h * w)
+        frontier = []
+        opened_rows = []
+        opened_cols = []
+
+        def cell_neighbors(cell):
+            row, col = divmod(cell, w)
+            ns = []
+            if row > 0:
+                ns.append(cell - w)
+            if row < h - 1:
+                ns.append(cell + w)
+            if col > 0:
+                ns.append(cell - 1)
+            if col < w - 1:
+                ns.append(cell + 1)
+            return ns
+
         # choose a random starting position
-        current_row, current_col = randrange(1, self.H, 2), randrange(1, self.W, 2)
-        grid[current_row][current_col] = 0
-
-        # created a weighted list of all vertices connected in the graph
-        neighbors = self._find_neighbors(current_row, current_col, grid, True)
-
-        # loop over all current neighbors, until empty
-        visited = 1
-
-        while visited < self.h * self.w:
-            # find neighbor with lowest weight, make it current
-            nn = randrange(len(neighbors))
-            current_row, current_col = neighbors[nn]
-            visited += 1
-            grid[current_row][current_col] = 0
-            neighbors = neighbors[:nn] + neighbors[nn + 1:]
-            # connect that neighbor to a random neighbor with grid[posi] == 0
-            nearest_n = self._find_neighbors(current_row, current_col, grid)[0]
-            grid[(current_row + nearest_n[0]) // 2][(current_col + nearest_n[1]) // 2] = 0
-
-            # find all unvisited neighbors of current, add them to neighbors
-            unvisited = self._find_neighbors(current_row, current_col, grid, True)
-            neighbors = list(set(neighbors + unvisited))
+        current = randrange(h * w)
+        visited[current] = 1
+        for neighbor in cell_neighbors(current):
+            in_frontier[neighbor] = 1
+            frontier.append(neighbor)
+
+        while frontier:
+            # take a random frontier cell out, moving the last one into its slot
+            nn = randrange(len(frontier))
+            current = frontier[nn]
+            frontier[nn] = frontier[-1]
+            frontier.pop()
+            visited[current] = 1
+
+            # connect it to a random visited neighbor, and add its unvisited neighbors to the frontier
+            neighbors = cell_neighbors(current)
+            connected = [n for n in neighbors if visited[n]]
+            nearest_n = connected[randrange(len(connected))]
+            row, col = divmod(current, w)
+            n_row, n_col = divmod(nearest_n, w)
+            opened_rows.append(row + n_row + 1)
+            opened_cols.append(col + n_col + 1)
+            for neighbor in neighbors:
+                if not visited[neighbor] and not in_frontier[neighbor]:
+                    in_frontier[neighbor] = 1
+                    frontier.append(neighbor)
+
+        grid[1:-1:2, 1:-1:2] = 0
+        grid[opened_rows, opened_cols] = 0
 
         return grid
 
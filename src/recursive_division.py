@@ -0,0 +1,65 @@
+from __future__ import absolute_import
+from maze_gen_algo import MazeGenAlgo
+from maze_gen_algo import np
+
+
+class RecursiveDivision(MazeGenAlgo):
+    """
+    Instead of carving passages, recursive division starts from an empty room and adds walls.
+
+    1. Start with one chamber covering the whole maze, without inner walls.
+    2. Split the chamber with a wall across it, across the shorter side of the chamber or in a random direction
+        if it is square, and leave one random gap in the wall.
+    3. Split both halves the same way, until the chambers are room_size cells wide or high.
+
+    Every wall is placed with a single slice assignment, and the pending chambers are kept on a work list instead
+    of the call stack. With the default room_size of 1 the result is a perfect maze, larger rooms stay open.
+    """
+
+    def __init__(self, h, w, seed=None, room_size=1):
+        super(RecursiveDivision, self).__init__(h, w, seed)
+        self.room_size = max(1, room_size)
+
+    def cache_parameters(self):
+        return (self.room_size,)
+
+    def generate(self):
+        # create a grid with the outer walls and the posts between the cells, and no walls inside
+        a = np.empty((self.H, self.W), dtype=np.int8)
+        a.fill(1)
+        grid = a
+        grid[1:-1, 1:-1] = 0
+        grid[2:-1:2, 2:-1:2] = 1
+
+        randrange = self.rng.randrange
+        room_size = self.room_size
+
+        # chambers as (first row, first col, last row, last col) of logical cells, inclusive
+        chambers = [(0, 0, self.h - 1, self.w - 1)]
+        while chambers:
+            r0, c0, r1, c1 = chambers.pop()
+            height = r1 - r0 + 1
+            width = c1 - c0 + 1
+            if height <= room_size or width <= room_size:
+                continue
+
+            if height > width or (height == width and randrange(2)):
+                # horizontal wall on the grid row between logical rows k - 1 and k, with a gap under one cell
+                k = randrange(r0 + 1, r1 + 1)
+                grid[2 * k, 2 * c0 + 1:2 * c1 + 2] = 1
+                grid[2 * k, 2 * randrange(c0, c1 + 1) + 1] = 0
+                chambers.append((r0, c0, k - 1, c1))
+                chambers.append((k, c0, r1, c1))
+            else:
+                # vertical wall on the grid column between logical columns k - 1 and k
+                k = randrange(c0 + 1, c1 + 1)
+                grid[2 * r0 + 1:2 * r1 + 2, 2 * k] = 1
+                grid[2 * randrange(r0, r1 + 1) + 1, 2 * k] = 0
+                chambers.append((r0, c0, r1, k - 1))
+                chambers.append((r0, k, r1, c1))
+
+        return grid
+
+    @staticmethod
+    def get_name():
+        return "Recursive Division"
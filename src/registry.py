@@ -0,0 +1,21 @@
+"""
+The maze generators and solvers offered by the UI and the exporter, in the order they are listed.
+"""
+from a_star import AStar, AStar2, BidirectionalAStar
+from aldous_broder import AldousBroder
+from bfs import BFS, BidirectionalBFS
+from binary_tree import BinaryTree
+from dfs import DFS
+from dijkstra import Dijkstra
+from eller import Eller
+from jps import JPS
+from kruskal import Kruskal
+from prims import Prims
+from recursive_division import RecursiveDivision
+from sidewinder import Sidewinder
+from wavefront import WavefrontBFS
+from wilson import Wilson
+
+maze_generators = [AldousBroder, Wilson, Prims, Kruskal, BinaryTree, Sidewinder, Eller, RecursiveDivision]
+
+solvers = [BFS, BidirectionalBFS, WavefrontBFS, DFS, Dijkstra, AStar, AStar2, BidirectionalAStar, JPS]
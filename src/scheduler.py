@@ -0,0 +1,78 @@
+from collections import deque
+from time import perf_counter
+
+
+class StepScheduler:
+    """
+    Decides how many solver steps run between two rendered frames.
+    Every frame gets a time budget, a share of the frame period at the target FPS, and runs as many steps as fit
+    in it, taking turns between the solvers that are still running so they advance at the same pace.
+    on_step(solver, element) is called with every element a step returns and on_finish(solver) once for each
+    solver, when it returns None. Rendering is left to the caller, once per frame.
+    """
+
+    def __init__(self, solvers, on_step, on_finish, fps=30, budget=None):
+        """
+        budget is the solving time per frame in seconds, 3/4 of the frame period by default """
+        self.solvers = list(solvers)
+        self.on_step = on_step
+        self.on_finish = on_finish
+        self.frame_period = 1.0 / fps
+        self.budget = budget if budget is not None else 0.75 * self.frame_period
+        self.active = deque(self.solvers)
+        self.next_frame = perf_counter()
+
+    def finished(self):
+        return len(self.active) == 0
+
+    def _step(self, solver):
+        """
+        Advances one solver by one step. Returns False once the solver is done """
+        element = next(solver)
+        if element is None:
+            self.on_finish(solver)
+            return False
+        self.on_step(solver, element)
+        return True
+
+    def wait_time(self):
+        """
+        Returns the seconds left until the next frame is due """
+        return max(0.0, self.next_frame - perf_counter())
+
+    def run_frame(self):
+        """
+        Runs steps round robin until the budget of this frame is used up or every solver is done.
+        Returns the number of steps run """
+        now = perf_counter()
+        deadline = now + self.budget
+        self.next_frame = max(self.next_frame + self.frame_period, now)
+
+        steps = 0
+        active = self.active
+        while active:
+            solver = active.popleft()
+            if self._step(solver):
+                active.append(solver)
+            steps += 1
+            if perf_counter() >= deadline:
+                break
+
+        return steps
+
+    def step_once(self):
+        """
+        Advances every running solver by exactly one step, for single-stepping """
+        for _ in range(len(self.active)):
+            solver = self.active.popleft()
+            if self._step(solver):
+                self.active.append(solver)
+
+    def run_to_completion(self):
+        """
+        Instant mode: runs every solver until it is done """
+        active = self.active
+        while active:
+            solver = active.popleft()
+            if self._step(solver):
+                active.append(solver)
@@ -0,0 +1,79 @@
+import numpy as np
+
+UNREACHED = -1
+NO_PARENT = -1
+
+
+class SearchState:
+    """
+    Array-backed bookkeeping shared by the solvers.
+    Every node of the graph is addressed by a flat index (r * w + c for the cells of an Adjacency), distances,
+    parents and the closed flags live in preallocated NumPy arrays and tuples are only used at the API edge.
+    """
+
+    def __init__(self, graph):
+        """
+        Allocating the arrays for a graph with graph.size nodes, which also converts between cells and indices """
+        self.index = graph.index
+        self.cell = graph.cell
+        size = graph.size
+
+        self.dist = np.full(size, UNREACHED, dtype=np.int32)
+        self.parent = np.full(size, NO_PARENT, dtype=np.int32)
+        self.closed = np.zeros(size, dtype=np.bool_)
+
+    def reached(self, index):
+        return self.dist[index] != UNREACHED
+
+    def path_to(self, index):
+        """
+        Follows the parent array from the given index and returns the cells from it back to the root as a list """
+        index = int(index)
+        total_path = [self.cell(index)]
+        parent = self.parent
+        while parent[index] != NO_PARENT:
+            index = int(parent[index])
+            total_path.append(self.cell(index))
+
+        return total_path
+
+
+class ShortestPathTree:
+    """
+    Result of a one-to-all search: the distance and parent arrays rooted at a single source.
+    Any goal can be queried without searching again.
+    """
+
+    def __init__(self, state, source):
+        self.state = state
+        self.source = source
+        self.source_index = state.index(source)
+
+    def reachable(self, goal):
+        return self.state.reached(self.state.index(goal))
+
+    def distance_to(self, goal):
+        """
+        Returns the number of steps from the source to the goal, or None if the goal can not be reached """
+        distance = self.state.dist[self.state.index(goal)]
+        if distance == UNREACHED:
+            return None
+        return int(distance)
+
+    def path_to(self, goal):
+        """
+        Returns the path from goal to the source as a list, or None if the goal can not be reached """
+        index = self.state.index(goal)
+        if not self.state.reached(index):
+            return None
+        return self.state.path_to(index)
+
+
+def meeting_path(forward, backward, index):
+    """
+    Joins the two halves of a bidirectional search that met at the given index.
+    Returns the path from the backward root (goal) to the forward root (start) as a list """
+    total_path = backward.path_to(index)
+    total_path.reverse()
+    total_path.extend(forward.path_to(index)[1:])
+    return total_path
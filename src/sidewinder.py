@@ -0,0 +1,51 @@
+from __future__ import absolute_import
+from maze_gen_algo import MazeGenAlgo
+from maze_gen_algo import np
+
+
+class Sidewinder(MazeGenAlgo):
+    """
+    1. The top row is one corridor.
+    2. On every other row, walk from west to east, growing a run of cells. After each cell flip a coin to either
+        open the wall to the east and keep going, or to close the run.
+    3. When a run is closed, one random cell of it opens the wall to its north.
+
+    The coin flips only depend on their own cell, so all rows are carved at once with NumPy: the runs are found
+    from the closes of the flattened rows, and the north openings are drawn once per run.
+    """
+
+    def __init__(self, h, w, seed=None):
+        super(Sidewinder, self).__init__(h, w, seed)
+
+    def generate(self):
+        # create empty grid, with every cell open
+        a = np.empty((self.H, self.W), dtype=np.int8)
+        a.fill(1)
+        grid = a
+        grid[1:-1:2, 1:-1:2] = 0
+
+        # the wall east of cell (r, c) is at (2r + 1, 2c + 2), the top row is a single corridor
+        grid[1, 2:-2:2] = 0
+
+        # the last cell of each row always closes its run, so runs never wrap to the next row
+        close = self.np_rng.integers(0, 2, size=(self.h - 1, self.w), dtype=np.uint8).view(np.bool_)
+        close[:, -1] = True
+        grid[3:-1:2, 2::2] = close
+
+        # each run ends at a close, the north opening is a random offset from the start of the run
+        ends = np.flatnonzero(close.ravel()).astype(np.int32)
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        offsets = self.np_rng.random(len(ends), dtype=np.float32) * (ends - starts + 1).astype(np.float32)
+        north = np.zeros(close.size, dtype=np.bool_)
+        north[starts + offsets.astype(np.int32)] = True
+
+        # the wall north of cell (r, c) is at (2r, 2c + 1), the rows here start at r = 1
+        grid[2:-1:2, 1:-1:2] = ~north.reshape(close.shape)
+
+        return grid
+
+    @staticmethod
+    def get_name():
+        return "Sidewinder"
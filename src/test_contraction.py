@@ -0,0 +1,95 @@
+"""
+Checks the contracted junction graph against the plain grid. Run it from this directory:
+
+    python -m unittest test_contraction
+"""
+import unittest
+from random import Random
+
+import numpy as np
+
+from a_star import AStar, AStar2, BidirectionalAStar
+from bfs import BFS, BidirectionalBFS
+from dfs import DFS
+from dijkstra import Dijkstra
+from jps import JPS
+from maze import Maze
+from wavefront import WavefrontBFS
+
+
+def carve_maze(h, w, seed, extra_openings=0):
+    """
+    A perfect h x w maze carved by a seeded depth-first walk. Every extra opening removes one more inner wall,
+    which closes a loop """
+    rng = Random(seed)
+    grid = np.ones((2 * h + 1, 2 * w + 1), dtype=np.int8)
+    grid[1, 1] = 0
+    stack = [(1, 1)]
+    while stack:
+        r, c = stack[-1]
+        steps = [(dr, dc) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                 if 0 < r + dr < 2 * h and 0 < c + dc < 2 * w and grid[r + dr, c + dc] == 1]
+        if not steps:
+            stack.pop()
+            continue
+        dr, dc = rng.choice(steps)
+        grid[r + dr // 2, c + dc // 2] = 0
+        grid[r + dr, c + dc] = 0
+        stack.append((r + dr, c + dc))
+
+    walls = [(r, c) for r in range(1, 2 * h) for c in range(1, 2 * w) if (r + c) % 2 == 1 and grid[r, c] == 1]
+    for r, c in rng.sample(walls, extra_openings):
+        grid[r, c] = 0
+
+    maze = Maze()
+    maze.grid = grid
+    return maze
+
+
+def solve(solver_class, graph, start, goal):
+    solver = solver_class(graph, start, goal)
+    while next(solver) is not None:
+        pass
+    return solver.get_path()
+
+
+def random_queries(maze, count, seed):
+    open_cells = maze.get_open_cells()
+    cells = [(int(r), int(c)) for r, c in zip(*open_cells.nonzero())]
+    rng = Random(seed)
+    return [(rng.choice(cells), rng.choice(cells)) for _ in range(count)]
+
+
+class ContractedGraphTest(unittest.TestCase):
+
+    def assert_shortest_paths(self, maze, queries):
+        contraction = maze.get_contraction()
+        for start, goal in queries:
+            expected = len(solve(BFS, maze.get_adjacency(), start, goal))
+            graph = contraction.with_endpoints(start, goal)
+            for solver_class in (Dijkstra, AStar, AStar2, BidirectionalAStar):
+                path = graph.expand(solve(solver_class, graph, start, goal))
+                self.assertEqual(len(path), expected, '%s from %s to %s' % (solver_class.get_name(), start, goal))
+                self.assertEqual((path[0], path[-1]), (goal, start))
+
+    def test_perfect_maze(self):
+        maze = carve_maze(20, 20, seed=1)
+        self.assert_shortest_paths(maze, random_queries(maze, 30, seed=1))
+
+    def test_maze_with_loops(self):
+        # Opened walls make several ways of different lengths between the same junctions
+        for seed in range(3):
+            maze = carve_maze(20, 20, seed=seed, extra_openings=40)
+            self.assert_shortest_paths(maze, random_queries(maze, 30, seed=seed))
+
+    def test_unit_cost_solvers_refuse_weights(self):
+        maze = carve_maze(10, 10, seed=0, extra_openings=10)
+        start, goal = random_queries(maze, 1, seed=0)[0]
+        graph = maze.get_contraction().with_endpoints(start, goal)
+        for solver_class in (BFS, BidirectionalBFS, DFS, JPS, WavefrontBFS):
+            with self.assertRaises(ValueError):
+                solver_class(graph, start, goal)
+
+
+if __name__ == '__main__':
+    unittest.main()
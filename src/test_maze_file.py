@@ -0,0 +1,74 @@
+"""
+Checks that mazes and their indexes survive a save and load. Run it from this directory:
+
+    python -m unittest test_maze_file
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from kruskal import Kruskal
+from maze import Maze
+from maze_file import PREAMBLE, MAGIC, VERSION, read_maze_file, write_maze_file
+from wavefront import distance_field
+
+
+class MazeFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test.maze')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assert_round_trip(self, header, arrays):
+        write_maze_file(self.path, header, arrays)
+        for mmap in (True, False):
+            read_header, read_arrays = read_maze_file(self.path, mmap)
+            self.assertEqual(read_header, header)
+            self.assertEqual(sorted(read_arrays), sorted(arrays))
+            for name, array in arrays.items():
+                self.assertEqual(read_arrays[name].dtype, array.dtype)
+                np.testing.assert_array_equal(read_arrays[name], array)
+
+    def test_header_lengths(self):
+        # Some header lengths make an offset one digit longer on the second layout pass
+        for length in range(0, 1200, 3):
+            for count in (1, 6, 15):
+                arrays = {'a%d' % i: np.arange(5, dtype=np.int8) + i for i in range(count)}
+                self.assert_round_trip({'generator': 'x' * length}, arrays)
+
+    def test_maze_with_indexes(self):
+        maze = Maze()
+        maze.generator = Kruskal(60, 60, seed=123456)
+        maze.generate()
+        maze.generate_entrances()
+        open_cells = maze.get_open_cells()
+        cells = list(zip(*np.nonzero(open_cells)))
+        indexes = {'distance_field_%d' % i: distance_field(open_cells, cells[i * 97]) for i in range(15)}
+        maze.save(self.path, indexes)
+
+        loaded = Maze.load(self.path)
+        np.testing.assert_array_equal(loaded.grid, maze.grid)
+        self.assertEqual((loaded.start, loaded.end), (maze.start, maze.end))
+        self.assertEqual(loaded.header['seed'], 123456)
+        for name, field in indexes.items():
+            np.testing.assert_array_equal(loaded.indexes[name], field)
+
+    def test_offset_inside_header(self):
+        header = {'arrays': {'a': {'dtype': '|i1', 'shape': [4], 'offset': 0}}}
+        text = json.dumps(header).encode('utf-8')
+        with open(self.path, 'wb') as f:
+            f.write(PREAMBLE.pack(MAGIC, VERSION, len(text)))
+            f.write(text)
+        with self.assertRaises(ValueError):
+            read_maze_file(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
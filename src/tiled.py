@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from maze_gen_algo import MazeGenAlgo
+from maze_gen_algo import np
+from disjoint_set import DisjointSet
+from kruskal import Kruskal
+
+
+def _tile_bounds(size, tile):
+    """
+    Splits 0..size into runs of about tile cells, a leftover smaller than 3 cells is added to the last run """
+    bounds = list(range(0, size, tile)) + [size]
+    if len(bounds) > 2 and bounds[-1] - bounds[-2] < 3:
+        del bounds[-2]
+    return bounds
+
+
+def _generate_tile(shm_name, shape, generator, r0, r1, c0, c1, seed):
+    """
+    Generates one tile and writes it into the shared grid. Neighbouring tiles share their border rows and
+    columns, which are walls in every tile """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        grid = np.ndarray(shape, dtype=np.int8, buffer=shm.buf)
+        grid[2 * r0:2 * r1 + 1, 2 * c0:2 * c1 + 1] = generator(r1 - r0, c1 - c0, seed).generate()
+        del grid
+    finally:
+        shm.close()
+
+
+def _generate_tile_in_worker(job):
+    return _generate_tile(*job)
+
+
+class Tiled(MazeGenAlgo):
+    """
+    Splits the maze into tiles, generates every tile with another MazeGenAlgo in its own process, then joins the
+    tiles into one perfect maze.
+
+    1. Each tile is a perfect maze of its own, written by its worker straight into a grid in shared memory, so
+        no grid is pickled between the processes.
+    2. A random spanning tree is drawn over the tiles, and for every edge of it one random wall on the seam
+        between the two tiles is opened. Tiles are trees joined by a tree, so the whole maze is a tree.
+    """
+
+    def __init__(self, h, w, seed=None, generator=Kruskal, tile_h=256, tile_w=256, processes=None):
+        super(Tiled, self).__init__(h, w, seed)
+        self.generator = generator
+        self.tile_h = max(3, tile_h)
+        self.tile_w = max(3, tile_w)
+        self.processes = processes
+
+    def cache_parameters(self):
+        return (self.generator.get_name(), self.tile_h, self.tile_w)
+
+    def generate(self):
+        rows = _tile_bounds(self.h, self.tile_h)
+        cols = _tile_bounds(self.w, self.tile_w)
+        tiles_h = len(rows) - 1
+        tiles_w = len(cols) - 1
+        shape = (self.H, self.W)
+
+        seeds = self.np_rng.integers(2 ** 63, size=tiles_h * tiles_w).tolist()
+        shm = shared_memory.SharedMemory(create=True, size=self.H * self.W)
+        try:
+            grid = np.ndarray(shape, dtype=np.int8, buffer=shm.buf)
+            grid.fill(1)
+
+            jobs = [(shm.name, shape, self.generator, rows[ty], rows[ty + 1], cols[tx], cols[tx + 1],
+                     seeds[ty * tiles_w + tx])
+                    for ty in range(tiles_h) for tx in range(tiles_w)]
+            if self.processes == 1 or len(jobs) < 2:
+                for job in jobs:
+                    _generate_tile(*job)
+            else:
+                processes = self.processes or os.cpu_count() or 1
+                with ProcessPoolExecutor(max_workers=processes) as executor:
+                    list(executor.map(_generate_tile_in_worker, jobs))
+
+            self._stitch(grid, rows, cols)
+            result = grid.copy()
+            del grid
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return result
+
+    def _stitch(self, grid, rows, cols):
+        """
+        Opens one wall on the seam of every edge of a random spanning tree over the tiles """
+        tiles_h = len(rows) - 1
+        tiles_w = len(cols) - 1
+
+        # seams as (first tile, second tile, vertical), tiles are numbered row by row
+        seams = [(ty * tiles_w + tx, ty * tiles_w + tx + 1, False)
+                 for ty in range(tiles_h) for tx in range(tiles_w - 1)]
+        seams += [(ty * tiles_w + tx, (ty + 1) * tiles_w + tx, True)
+                  for ty in range(tiles_h - 1) for tx in range(tiles_w)]
+        self.rng.shuffle(seams)
+
+        tiles = DisjointSet(tiles_h * tiles_w)
+        for first, second, vertical in seams:
+            if not tiles.union(first, second):
+                continue
+            ty, tx = divmod(first, tiles_w)
+            if vertical:
+                # the seam is the grid row below the tile, open it under a random cell of the tile
+                col = self.rng.randrange(cols[tx], cols[tx + 1])
+                grid[2 * rows[ty + 1], 2 * col + 1] = 0
+            else:
+                row = self.rng.randrange(rows[ty], rows[ty + 1])
+                grid[2 * row + 1, 2 * cols[tx + 1]] = 0
+
+    @staticmethod
+    def get_name():
+        return "Tiled"
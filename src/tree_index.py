@@ -0,0 +1,127 @@
+import numpy as np
+
+NO_PARENT = -1
+
+
+class TreeIndex:
+    """
+    Path index for perfect mazes, where the open cells form a tree and every pair of cells has exactly one path.
+    The tree is rooted once (one root per connected part), then binary lifting tables give the lowest common
+    ancestor of two cells in O(log n). Distances follow from the depths, and a path is read by walking up the
+    parents from both cells, so queries never search.
+    """
+
+    def __init__(self, adjacency):
+        """
+        Rooting the tree of the adjacency and building the lifting tables.
+        Raises a ValueError if the open cells contain a loop """
+        self.adjacency = adjacency
+        self.index = adjacency.index
+        self.cell = adjacency.cell
+        neighbours = adjacency.neighbours
+        size = adjacency.size
+
+        parent = [NO_PARENT] * size
+        depth = [0] * size
+        component = [NO_PARENT] * size
+
+        for root in np.flatnonzero(adjacency.open.ravel()).tolist():
+            if component[root] != NO_PARENT:
+                continue
+            component[root] = root
+            queue = [root]
+            for current in queue:
+                for neighbour in neighbours[current]:
+                    if neighbour == parent[current]:
+                        continue
+                    if component[neighbour] != NO_PARENT:
+                        raise ValueError('The maze has loops, a tree index needs a perfect maze.')
+                    component[neighbour] = root
+                    parent[neighbour] = current
+                    depth[neighbour] = depth[current] + 1
+                    queue.append(neighbour)
+
+        self.parent = np.array(parent, dtype=np.int32)
+        self.depth = np.array(depth, dtype=np.int32)
+        self.component = np.array(component, dtype=np.int32)
+
+        # up[k][i] is the ancestor 2^k levels above i, roots are their own ancestors
+        flat = np.arange(size, dtype=np.int32)
+        first = np.where(self.parent == NO_PARENT, flat, self.parent)
+        levels = max(1, int(self.depth.max(initial=0)).bit_length())
+        self.up = np.empty((levels, size), dtype=np.int32)
+        self.up[0] = first
+        for level in range(1, levels):
+            self.up[level] = self.up[level - 1][self.up[level - 1]]
+
+    def _ancestor(self, index, steps):
+        """
+        Returns the ancestor the given number of steps above the index """
+        level = 0
+        while steps:
+            if steps & 1:
+                index = self.up[level, index]
+            steps >>= 1
+            level += 1
+        return int(index)
+
+    def _lca(self, a, b):
+        depth = self.depth
+        if depth[a] < depth[b]:
+            a, b = b, a
+        a = self._ancestor(a, int(depth[a] - depth[b]))
+        if a == b:
+            return a
+
+        up = self.up
+        for level in range(len(up) - 1, -1, -1):
+            if up[level, a] != up[level, b]:
+                a = up[level, a]
+                b = up[level, b]
+        return int(up[0, a])
+
+    def connected(self, start, goal):
+        a = self.index(start)
+        b = self.index(goal)
+        return self.component[a] != NO_PARENT and self.component[a] == self.component[b]
+
+    def lca(self, start, goal):
+        """
+        Returns the lowest common ancestor of two cells as a (row, column) tuple, or None if they are not connected """
+        if not self.connected(start, goal):
+            return None
+        return self.cell(self._lca(self.index(start), self.index(goal)))
+
+    def distance(self, start, goal):
+        """
+        Returns the number of steps between two cells, or None if they are not connected """
+        if not self.connected(start, goal):
+            return None
+        a = self.index(start)
+        b = self.index(goal)
+        return int(self.depth[a] + self.depth[b] - 2 * self.depth[self._lca(a, b)])
+
+    def path(self, start, goal):
+        """
+        Returns the path from goal to start as a list, like the solvers' get_path, or None if they are not connected """
+        if not self.connected(start, goal):
+            return None
+        a = self.index(start)
+        b = self.index(goal)
+        meet = self._lca(a, b)
+        parent = self.parent
+
+        total_path = []
+        while b != meet:
+            total_path.append(self.cell(b))
+            b = parent[b]
+        total_path.append(self.cell(meet))
+
+        start_half = []
+        while a != meet:
+            start_half.append(self.cell(a))
+            a = parent[a]
+        start_half.reverse()
+        total_path.extend(start_half)
+
+        return total_path
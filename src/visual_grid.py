@@ -0,0 +1,86 @@
+import numpy as np
+from PIL import Image
+
+# Colours of the solver animation
+START_COLOR = (255, 53, 22)
+END_COLOR = (2, 255, 32)
+VISITED_COLOR = (51, 109, 204)
+PATH_COLOR = (53, 165, 24)
+
+# State codes of the cells of a solver's view, PALETTE holds the colour every state is drawn in
+WALL = 0
+OPEN = 1
+START = 2
+END = 3
+VISITED = 4
+PATH = 5
+
+PALETTE = [(0, 0, 0), (255, 255, 255), START_COLOR, END_COLOR, VISITED_COLOR, PATH_COLOR]
+# Palette of a "P" mode image, padded to the 256 entries PIL expects
+PALETTE_DATA = [value for color in PALETTE for value in color] + [0] * (3 * (256 - len(PALETTE)))
+# Tk colour names of the states, for painting single cells
+PALETTE_NAMES = ['#%02x%02x%02x' % color for color in PALETTE]
+
+
+def palette_image(state):
+    """
+    Turns a 2d uint8 array of state codes into a "P" mode PIL image, the colours are applied by its palette """
+    image = Image.fromarray(np.ascontiguousarray(state, dtype=np.uint8), 'P')
+    image.putpalette(PALETTE_DATA)
+    return image
+
+
+class VisualGrid:
+    """
+    What one solver's view of the maze looks like: one uint8 state code per grid cell plus the set of cells that
+    changed since the last frame. Colours only come in through the palette when a frame is turned into an image,
+    so painting a step is a single indexed assignment. It does not depend on Tk, so the UI and the headless
+    exporter draw from the same state.
+    """
+
+    def __init__(self, maze):
+        self.state = np.where(np.asarray(maze.grid) == 1, WALL, OPEN).astype(np.uint8)
+        self.dirty_cells = set()
+        self.end = maze.end
+        self.paint_entrances(maze.start, maze.end)
+
+    def paint_entrances(self, start, end):
+        self.recolor_point(start[0], start[1], START)
+        self.recolor_point(end[0], end[1], END)
+
+    def recolor_point(self, r, c, state):
+        self.state[r, c] = state
+        self.dirty_cells.add((r, c))
+
+    def draw_final_path(self, path, state=PATH):
+        self.paint_cells(path, state)
+
+    def paint_cells(self, cells, state):
+        """
+        Sets the state of every (row, column) cell in cells with one indexed assignment """
+        if not cells:
+            return
+        rows, cols = zip(*cells)
+        self.state[rows, cols] = state
+        self.dirty_cells.update(cells)
+
+    def paint_step(self, new_elem):
+        """
+        Marks what a solver step returned as visited, a single cell or a list of cells """
+        if type(new_elem) is list:
+            self.paint_cells(new_elem, VISITED)
+        else:
+            self.recolor_point(new_elem[0], new_elem[1], VISITED)
+
+    def paint_solution(self, path):
+        """
+        Marks the end as reached and draws the solver's path """
+        self.recolor_point(self.end[0], self.end[1], VISITED)
+        self.draw_final_path(path)
+
+    def take_dirty_cells(self):
+        """
+        Returns the cells changed since the last call and starts a new frame """
+        dirty_cells = self.dirty_cells
+        self.dirty_cells = set()
+        return dirty_cells
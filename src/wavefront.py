@@ -0,0 +1,162 @@
+import numpy as np
+
+from adjacency import as_grid_adjacency
+from search_state import UNREACHED
+
+
+def open_cells_of(graph):
+    """
+    Boolean array of the walkable cells, from a maze grid (1 marks a wall) or from an Adjacency """
+    if isinstance(graph, np.ndarray):
+        return graph != 1
+    return as_grid_adjacency(graph).open
+
+
+class Wavefront:
+    """
+    Breadth-first search that advances a whole frontier layer at once with array operations.
+    The grid is padded with a ring of walls and flattened, so shifting the frontier one cell north, south, west or
+    east is adding -W, W, -1 or 1 to the flat indices of its cells. The shifted cells are masked with the unvisited
+    open cells and the new layer is stamped into an int32 distance field. The cost of a step depends on the size
+    of the frontier, not on the size of the maze.
+    """
+
+    def __init__(self, open_cells, source):
+        """
+        Initializing the distance field and the first frontier, made of the source cell """
+        open_cells = np.asarray(open_cells, dtype=np.bool_)
+        self.h, self.w = open_cells.shape
+        self.source = source
+
+        self.stride = self.w + 2
+        padded = np.zeros((self.h + 2, self.stride), dtype=np.bool_)
+        padded[1:-1, 1:-1] = open_cells
+        self.unvisited = padded.ravel()
+        self.shifts = np.array([-self.stride, self.stride, -1, 1])
+
+        padded_dist = np.full(padded.shape, UNREACHED, dtype=np.int32)
+        self._flat_dist = padded_dist.ravel()
+        # The distance field handed out is the view without the padding
+        self.dist = padded_dist[1:-1, 1:-1]
+
+        self.level = 0
+        first = (source[0] + 1) * self.stride + source[1] + 1
+        if not self.unvisited[first]:
+            # A source inside a wall reaches nothing, not even itself
+            self.frontier = np.array([], dtype=np.intp)
+            return
+
+        self.frontier = np.array([first])
+        self.unvisited[first] = False
+        self._flat_dist[first] = 0
+
+    def step(self):
+        """
+        Advances the frontier by one layer. Returns the (rows, columns) of the new layer, or None when the whole
+        reachable area has been covered """
+        if len(self.frontier) == 0:
+            return None
+
+        shifted = (self.frontier[:, None] + self.shifts).ravel()
+        layer = np.unique(shifted[self.unvisited[shifted]])
+        self.frontier = layer
+        if len(layer) == 0:
+            return None
+
+        self.level += 1
+        self.unvisited[layer] = False
+        self._flat_dist[layer] = self.level
+        rows, cols = np.divmod(layer, self.stride)
+        return rows - 1, cols - 1
+
+    def run(self, target=None):
+        """
+        Advances until the target is reached, or until every reachable cell has its distance if there is no target.
+        Returns the distance field """
+        while target is None or self.dist[target] == UNREACHED:
+            if self.step() is None:
+                break
+
+        return self.dist
+
+
+def distance_field(graph, source):
+    """
+    BFS distance from the source to every cell of the maze as an int32 array, UNREACHED for cells it can't reach """
+    return Wavefront(open_cells_of(graph), source).run()
+
+
+def descend(dist, goal):
+    """
+    Rebuilds a shortest path by walking down the gradient of a distance field.
+    Returns the path from goal to the source of the field as a list, or None if the goal was not reached """
+    if dist[goal] == UNREACHED:
+        return None
+
+    h, w = dist.shape
+    r, c = goal
+    total_path = [goal]
+    level = int(dist[goal])
+    while level > 0:
+        level -= 1
+        if r > 0 and dist[r - 1, c] == level:
+            r -= 1
+        elif r < h - 1 and dist[r + 1, c] == level:
+            r += 1
+        elif c > 0 and dist[r, c - 1] == level:
+            c -= 1
+        else:
+            c += 1
+        total_path.append((r, c))
+
+    return total_path
+
+
+class WavefrontBFS:
+    """
+    Breadth-first search solver for maze graph that runs on the vectorized Wavefront engine.
+    Each step discovers a whole layer of cells
+    """
+
+    def __init__(self, graph, start, goal):
+        """
+        Initializing all of the parameters necessary to solve the maze using the wavefront BFS """
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.wavefront = Wavefront(open_cells_of(graph), start)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """
+        This makes the solver work in a Python generator style fashion, allowing the visualizer to call next until
+        None is returned, which signifies that the maze has been solved
+        """
+        if self.wavefront.dist[self.goal] != UNREACHED:
+            return None
+
+        layer = self.wavefront.step()
+        if layer is None:
+            return None
+
+        rows, cols = layer
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    def get_distance_field(self):
+        """
+        Finishes the search over the whole maze and returns the distance of every cell from the start """
+        return self.wavefront.run()
+
+    def get_path(self):
+        """
+        Returns the path from goal to start as a list """
+        total_path = descend(self.wavefront.dist, self.goal)
+        if total_path is None:
+            return [self.goal]
+        return total_path
+
+    @staticmethod
+    def get_name():
+        return "BFS (wavefront)"
@@ -0,0 +1,81 @@
+from __future__ import absolute_import
+from maze_gen_algo import MazeGenAlgo
+from maze_gen_algo import np
+
+
+class Wilson(MazeGenAlgo):
+    """
+    Wilson's algorithm, which samples from the same uniform distribution over spanning trees as Aldous-Broder but
+    only walks until it hits the tree built so far, instead of until it has covered the whole grid.
+
+    1. Add a random cell to the tree.
+    2. From a cell not in the tree, do a random walk until a cell of the tree is hit. Every cell remembers the
+        direction it was last left in, which erases the loops of the walk.
+    3. Follow the remembered directions from the starting cell, adding the path to the tree.
+    4. Repeat steps 2 and 3 until every cell is in the tree.
+    """
+
+    def __init__(self, h, w, seed=None):
+        super(Wilson, self).__init__(h, w, seed)
+
+    def generate(self):
+        # create empty grid
+        a = np.empty((self.H, self.W), dtype=np.int8)
+        a.fill(1)
+        grid = a
+
+        # cells are numbered row by row, with their neighbours listed once up front
+        h, w = self.h, self.w
+        size = h * w
+        neighbors = []
+        for row in range(h):
+            for col in range(w):
+                cell = row * w + col
+                ns = []
+                if row > 0:
+                    ns.append(cell - w)
+                if row < h - 1:
+                    ns.append(cell + w)
+                if col > 0:
+                    ns.append(cell - 1)
+                if col < w - 1:
+                    ns.append(cell + 1)
+                neighbors.append(ns)
+
+        choice = self.rng.choice
+        in_tree = bytearray(size)
+        next_cell = [0] * size
+        opened_rows = []
+        opened_cols = []
+
+        in_tree[self.rng.randrange(size)] = 1
+        for start in range(size):
+            if in_tree[start]:
+                continue
+
+            # loop-erased random walk, overwriting next_cell erases any loop the walk closed
+            current = start
+            while not in_tree[current]:
+                step = choice(neighbors[current])
+                next_cell[current] = step
+                current = step
+
+            # add the erased walk to the tree, opening the wall between each pair of cells
+            current = start
+            while not in_tree[current]:
+                in_tree[current] = 1
+                step = next_cell[current]
+                row, col = divmod(current, w)
+                n_row, n_col = divmod(step, w)
+                opened_rows.append(row + n_row + 1)
+                opened_cols.append(col + n_col + 1)
+                current = step
+
+        grid[1:-1:2, 1:-1:2] = 0
+        grid[opened_rows, opened_cols] = 0
+
+        return grid
+
+    @staticmethod
+    def get_name():
+        return "Wilson"